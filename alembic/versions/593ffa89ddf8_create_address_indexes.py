@@ -0,0 +1,41 @@
+"""Create address indexes
+
+Revision ID: 593ffa89ddf8
+Revises: 39203191ad31
+Create Date: 2026-10-18 09:12:41.503217
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "593ffa89ddf8"
+down_revision = "39203191ad31"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_address_addresses_discriminator_parent_id",
+        "address_addresses",
+        ["discriminator", "parent_id"],
+    )
+    op.create_index(
+        "ix_address_addresses_is_default",
+        "address_addresses",
+        ["discriminator", "parent_id"],
+        postgresql_where=sa.text("is_default"),
+        sqlite_where=sa.text("is_default"),
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_address_addresses_is_default", table_name="address_addresses"
+    )
+    op.drop_index(
+        "ix_address_addresses_discriminator_parent_id",
+        table_name="address_addresses",
+    )
@@ -0,0 +1,44 @@
+"""Create revoked tokens table
+
+Revision ID: 5b8e0f6a1d74
+Revises: d41e7a2b9c53
+Create Date: 2026-10-18 15:48:30.602185
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b8e0f6a1d74"
+down_revision = "d41e7a2b9c53"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_revoked_tokens",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("jti", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("expire_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["user_users.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jti"),
+    )
+    op.create_index(
+        "ix_user_revoked_tokens_expire_at",
+        "user_revoked_tokens",
+        ["expire_at"],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_user_revoked_tokens_expire_at", table_name="user_revoked_tokens"
+    )
+    op.drop_table("user_revoked_tokens")
@@ -0,0 +1,37 @@
+"""Create store unique indexes
+
+Revision ID: 8f3b1c9d4e27
+Revises: c6d506d5fddc
+Create Date: 2026-10-18 14:26:09.318442
+
+The indexes can not be created while there are duplicate segment titles,
+store titles or store legal names, which must be cleaned up before
+upgrading. Until then, ``UNIQUE_VALIDATION`` must stay ``query``, as the
+``constraint`` mode relies on these indexes.
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8f3b1c9d4e27"
+down_revision = "c6d506d5fddc"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_store_segments_title", "store_segments", ["title"], unique=True
+    )
+    op.create_index(
+        "ix_store_stores_title", "store_stores", ["title"], unique=True
+    )
+    op.create_index(
+        "ix_store_stores_legal", "store_stores", ["legal"], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_store_stores_legal", table_name="store_stores")
+    op.drop_index("ix_store_stores_title", table_name="store_stores")
+    op.drop_index("ix_store_segments_title", table_name="store_segments")
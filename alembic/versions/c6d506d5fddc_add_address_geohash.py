@@ -0,0 +1,56 @@
+"""Add address geohash
+
+Revision ID: c6d506d5fddc
+Revises: 593ffa89ddf8
+Create Date: 2026-10-18 10:03:17.842906
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+from app.address.geo import encode_geohash
+
+# revision identifiers, used by Alembic.
+revision = "c6d506d5fddc"
+down_revision = "593ffa89ddf8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "address_addresses",
+        sa.Column("geohash", sa.String(length=12), nullable=True),
+    )
+    op.create_index(
+        "ix_address_addresses_geohash", "address_addresses", ["geohash"]
+    )
+
+    addresses = sa.table(
+        "address_addresses",
+        sa.column("id", sa.Integer),
+        sa.column("lat", sa.Float),
+        sa.column("lng", sa.Float),
+        sa.column("geohash", sa.String),
+    )
+
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(addresses.c.id, addresses.c.lat, addresses.c.lng).where(
+            addresses.c.lat.isnot(None), addresses.c.lng.isnot(None)
+        )
+    ).all()
+
+    for row in rows:
+        connection.execute(
+            addresses.update()
+            .where(addresses.c.id == row.id)
+            .values(geohash=encode_geohash(float(row.lat), float(row.lng)))
+        )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_address_addresses_geohash", table_name="address_addresses"
+    )
+    op.drop_column("address_addresses", "geohash")
@@ -0,0 +1,41 @@
+"""Create refresh tokens table
+
+Revision ID: d41e7a2b9c53
+Revises: 8f3b1c9d4e27
+Create Date: 2026-10-18 15:02:44.127930
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d41e7a2b9c53"
+down_revision = "8f3b1c9d4e27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_refresh_tokens",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("expire_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["user_users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token_hash"),
+    )
+    op.create_index(
+        "ix_user_refresh_tokens_user_id", "user_refresh_tokens", ["user_id"]
+    )
+
+
+def downgrade():
+    op.drop_index(
+        "ix_user_refresh_tokens_user_id", table_name="user_refresh_tokens"
+    )
+    op.drop_table("user_refresh_tokens")
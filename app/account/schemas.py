@@ -3,7 +3,8 @@ from typing import List, Optional
 
 from pydantic import BaseModel, Field, validator
 
-from app.address.schemas import AddressCreate
+from app.address.schemas import Address, AddressCreate
+from app.core.schemas import OrmGetterDict
 
 
 class UserBase(BaseModel):
@@ -63,9 +64,11 @@ class Account(AccountBase):
     email_verified_at: datetime = None
     is_admin: bool = False
     is_celebrity: bool = False
+    addresses: Optional[List[Address]] = None
 
     class Config:
         orm_mode = True
+        getter_dict = OrmGetterDict
 
 
 class PasswordResetTokenCreate(BaseModel):
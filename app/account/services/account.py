@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 
 from fastapi.encoders import jsonable_encoder
 from fastapi.logger import logger
@@ -7,6 +7,9 @@ from sqlalchemy.future import select
 
 from app.account.schemas import AccountCreate, AccountUpdate
 from app.address.models import Address
+from app.auth.services import invalidate_user, revoke_refresh_tokens
+from app.core.services import get_loader_options
+from app.user.hashers import hash_password
 from app.user.models import User
 
 
@@ -29,7 +32,10 @@ async def create(
     else:
         create_data.pop("addresses")
 
+    password = create_data.pop("password")
+
     instance = User(**create_data)
+    instance.set_password_hash(*await hash_password(password))
     session.add(instance)
     await session.commit()
 
@@ -40,11 +46,15 @@ async def get(
     *,
     session: AsyncSession,
     account_id: int,
+    include: List[str] = None,
 ) -> Optional[User]:
     """Get a account by id."""
-    query = await session.execute(select(User).filter_by(id=account_id))
+    query = await session.execute(
+        select(User)
+        .filter_by(id=account_id)
+        .options(*get_loader_options(User, include))
+    )
     account = query.scalar_one_or_none()
-    await session.commit()
 
     return account
 
@@ -57,7 +67,6 @@ async def get_by_email(
     """Get a account by email."""
     query = await session.execute(select(User).filter_by(email=email))
     account = query.scalar_one_or_none()
-    await session.commit()
 
     return account
 
@@ -66,6 +75,7 @@ async def update(
     *, session: AsyncSession, account: User, account_in: AccountUpdate
 ):
     """Update a account."""
+    email = account.email
     account_data = jsonable_encoder(account)
     update_data = account_in.dict(exclude_unset=True)
 
@@ -74,9 +84,13 @@ async def update(
             setattr(account, field, update_data[field])
 
     if "password" in update_data and update_data["password"] is not None:
-        setattr(account, "password", update_data["password"])
+        account.set_password_hash(
+            *await hash_password(update_data["password"])
+        )
+        await revoke_refresh_tokens(session=session, user_id=account.id)
 
     await session.commit()
+    invalidate_user(email)
 
     return account
 
@@ -85,6 +99,7 @@ async def delete(*, session: AsyncSession, account: User):
     """Delete a account."""
     await session.delete(account)
     await session.commit()
+    invalidate_user(account.email)
 
     logger.info(
         "Account deleted successfully with={}".format(
@@ -48,7 +48,6 @@ async def is_valid_token(session: AsyncSession, token: str, email: str):
     )
 
     is_valid = query.scalar_one()
-    await session.commit()
 
     return bool(is_valid)
 
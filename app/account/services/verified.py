@@ -7,6 +7,7 @@ from fastapi.logger import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.account.schemas import AccountEmailVerify
+from app.auth.services import invalidate_user
 from app.user.models import User
 
 
@@ -22,6 +23,7 @@ async def mark_email_as_verified(
             setattr(account, field, update_data[field])
 
     await session.commit()
+    invalidate_user(account.email)
 
     return account
 
@@ -4,12 +4,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.account.schemas import Account
+from app.config import get_settings
 from app.user.models import User
 
 
 async def validate_account(
     *, session: AsyncSession, account_in: Account, account: Account = None
 ):
+    if get_settings().UNIQUE_VALIDATION == "constraint":
+        # The violations are reported by validate_unique_constraints.
+        return
+
     clauses = []
     for field in ["email", "nickname", "document_number"]:
         if getattr(account_in, field) is not None:
@@ -25,8 +30,6 @@ async def validate_account(
 
     query = await session.execute(stmt.with_only_columns(func.count()))
 
-    await session.commit()
-
     if query.scalar_one():
         detail = []
 
@@ -5,11 +5,13 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.account.schemas import Account, AccountCreate, AccountUpdate
-from app.account.services.account import create, delete, update
+from app.account.services.account import create, delete, get, update
 from app.account.services.verified import generate_verify_email_url
 from app.account.validators import validate_account
 from app.auth.depends import current_user_verified
 from app.config import get_settings
+from app.core.depends import include_parameters
+from app.core.validators import validate_unique_constraints
 from app.depends import get_session
 from app.notification.tasks import send_mail_verification
 
@@ -34,7 +36,8 @@ async def create_account(
 
     await validate_account(session=session, account_in=account_in)
 
-    account = await create(session=session, account_in=account_in)
+    async with validate_unique_constraints(session=session):
+        account = await create(session=session, account_in=account_in)
     logger.info(
         "User account created successfully with={}".format(
             {
@@ -66,10 +69,20 @@ async def create_account(
     summary="Get account.",
     response_model=Account,
 )
-async def get_account(*, account_in: Account = Depends(current_user_verified)):
+async def get_account(
+    *,
+    session: AsyncSession = Depends(get_session),
+    account_in: Account = Depends(current_user_verified),
+    include: list = Depends(include_parameters),
+):
+    if include:
+        account_in = await get(
+            session=session, account_id=account_in.id, include=include
+        )
+
     logger.info(
         "Response of get user account with={}".format(
-            {"user_id": account_in.id}
+            {"user_id": account_in.id, "include": include}
         )
     )
     return account_in
@@ -90,7 +103,8 @@ async def update_account(
         session=session, account_in=account_in, account=account
     )
 
-    await update(session=session, account=account, account_in=account_in)
+    async with validate_unique_constraints(session=session):
+        await update(session=session, account=account, account_in=account_in)
 
     logger.info(
         "Response of update user account with={}".format(
@@ -8,15 +8,27 @@ from app.account.schemas import Account
 from app.address.models import Address as AddressModel
 from app.address.schemas import (
     Address,
+    AddressBatch,
+    AddressBatchResult,
     AddressCreate,
     AddressPagination,
     AddressUpdate,
 )
-from app.address.services import create, delete, get, update
+from app.address.services import (
+    batch,
+    create,
+    delete,
+    get,
+    select_by_parent,
+    update,
+)
+from app.address.validators import validate_address_batch
 from app.auth.depends import current_user_verified
 from app.core.depends import pagination_parameters
+from app.core.responses import SchemaJSONResponse
 from app.core.services import search_filter_sort_paginate
-from app.depends import get_session
+from app.core.validators import validate_fields
+from app.depends import get_read_session, get_session
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -65,23 +77,21 @@ async def create_account_address(
 )
 async def get_account_addresses(
     *,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     common: dict = Depends(pagination_parameters),
     account: Account = Depends(current_user_verified),
 ):
-    common["filter_spec"].append(
-        {
-            "model": "Address",
-            "field": "parent_id",
-            "op": "eq",
-            "value": account.id,
-        }
-    )
-
     logger.info(f"Starting get account addresses with={common}")
 
+    await validate_fields(
+        fields=common["fields"], model=AddressModel, schema=Address
+    )
+
     pagination = await search_filter_sort_paginate(
-        session=session, model=AddressModel, **common
+        session=session,
+        model=AddressModel,
+        stmt=select_by_parent(parent_id=account.id, discriminator="user"),
+        **common,
     )
 
     logger.info(
@@ -97,7 +107,50 @@ async def get_account_addresses(
         )
     )
 
-    return pagination
+    # Sparse items are returned as they are, the others are mapped to the
+    # fields of the response model without being validated against it.
+    return SchemaJSONResponse(
+        pagination, schema=None if common["fields"] else AddressPagination
+    )
+
+
+@router.put(
+    "/accounts/addresses:batch",
+    summary="Batch account addresses.",
+    response_model=AddressBatchResult,
+)
+async def batch_account_addresses(
+    *,
+    session: AsyncSession = Depends(get_session),
+    batch_in: AddressBatch,
+    account: Account = Depends(current_user_verified),
+):
+    logger.info(
+        "Starting batch account addresses with={}".format(
+            {
+                "user_id": account.id,
+                "batch_in": batch_in,
+            }
+        )
+    )
+
+    await validate_address_batch(
+        session=session, batch_in=batch_in, parent=account
+    )
+
+    result = await batch(session=session, batch_in=batch_in, parent=account)
+
+    logger.info(
+        "Account addresses batched successfully with={}".format(
+            {
+                "user_id": account.id,
+                "created": result["created"],
+                "updated": result["updated"],
+                "deleted": result["deleted"],
+            }
+        )
+    )
+    return result
 
 
 @router.get(
@@ -107,7 +160,7 @@ async def get_account_addresses(
 )
 async def get_account_address(
     *,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     address_id: int,
     account: Account = Depends(current_user_verified),
 ):
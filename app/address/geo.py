@@ -0,0 +1,163 @@
+import math
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9
+"""Precision of the geohashes stored for the addresses, cells of ~5m."""
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+MAX_CELLS = 16
+"""Maximum number of geohash cells searched to cover a radius."""
+
+
+def encode_geohash(lat: float, lng: float, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a geohash of ``precision`` characters."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    geohash, bits, bit_count, is_lng = [], 0, 0, True
+
+    while len(geohash) < precision:
+        value, value_range = (lng, lng_range) if is_lng else (lat, lat_range)
+        middle = (value_range[0] + value_range[1]) / 2
+
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            value_range[0] = middle
+        else:
+            value_range[1] = middle
+
+        is_lng = not is_lng
+        bit_count += 1
+
+        if bit_count == 5:
+            geohash.append(GEOHASH_BASE32[bits])
+            bits, bit_count = 0, 0
+
+    return "".join(geohash)
+
+
+def get_cell_size(precision: int):
+    """Get the ``(lat, lng)`` size in degrees of the geohash cells of
+    ``precision`` characters."""
+    lng_bits = math.ceil(precision * 5 / 2)
+    lat_bits = math.floor(precision * 5 / 2)
+
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def get_cell_upper_bound(cell: str):
+    """Get the smallest geohash which sorts after every geohash of
+    ``cell``, or ``None`` when there is none.
+
+    It is the successor of the last character of ``cell`` in the base32
+    alphabet, carried over to the previous characters, so that the range
+    holds whatever the collation orders punctuation as.
+    """
+    while cell:
+        index = GEOHASH_BASE32.index(cell[-1])
+        if index + 1 < len(GEOHASH_BASE32):
+            return cell[:-1] + GEOHASH_BASE32[index + 1]
+
+        cell = cell[:-1]
+
+    return None
+
+
+def get_bounding_boxes(lat: float, lng: float, radius_km: float):
+    """Get the ``(min_lat, min_lng, max_lat, max_lng)`` boxes around the
+    circle of ``radius_km`` centered on the coordinate.
+
+    The box is split in two when it crosses the antimeridian, and spans
+    every longitude when it reaches a pole.
+    """
+    lat_delta = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(lat - lat_delta, -90.0), min(lat + lat_delta, 90.0)
+
+    if min_lat == -90.0 or max_lat == 90.0:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+
+    # A degree of longitude is shortest on the parallel farthest from the
+    # equator, which is the one bounding the width of the circle.
+    farthest_lat = max(abs(min_lat), abs(max_lat))
+    lng_delta = radius_km / (
+        KM_PER_DEGREE * max(math.cos(math.radians(farthest_lat)), 0.01)
+    )
+
+    if lng_delta >= 180.0:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+
+    min_lng, max_lng = lng - lng_delta, lng + lng_delta
+
+    if min_lng < -180.0:
+        return [
+            (min_lat, min_lng + 360.0, max_lat, 180.0),
+            (min_lat, -180.0, max_lat, max_lng),
+        ]
+
+    if max_lng > 180.0:
+        return [
+            (min_lat, min_lng, max_lat, 180.0),
+            (min_lat, -180.0, max_lat, max_lng - 360.0),
+        ]
+
+    return [(min_lat, min_lng, max_lat, max_lng)]
+
+
+def _get_box_cells(box, precision: int):
+    min_lat, min_lng, max_lat, max_lng = box
+    lat_size, lng_size = get_cell_size(precision)
+
+    lat_start = math.floor(min_lat / lat_size)
+    lng_start = math.floor(min_lng / lng_size)
+    lat_steps = math.floor(max_lat / lat_size) - lat_start + 1
+    lng_steps = math.floor(max_lng / lng_size) - lng_start + 1
+
+    # The center of each cell crossed by the box is encoded.
+    return lat_steps * lng_steps, (
+        encode_geohash(
+            min((lat_start + i + 0.5) * lat_size, 90),
+            min((lng_start + j + 0.5) * lng_size, 180),
+            precision,
+        )
+        for i in range(lat_steps)
+        for j in range(lng_steps)
+    )
+
+
+def get_covering_cells(lat: float, lng: float, radius_km: float):
+    """Get the geohash prefixes whose cells cover the circle of
+    ``radius_km`` centered on the coordinate.
+
+    The most precise cells are used which keep their number under
+    :data:`MAX_CELLS`, so that the candidates are pruned as much as
+    possible with a few index range scans.
+    """
+    boxes = get_bounding_boxes(lat, lng, radius_km)
+
+    cells = {""}
+    for precision in range(1, GEOHASH_PRECISION + 1):
+        box_cells = [_get_box_cells(box, precision) for box in boxes]
+        if sum(count for count, _ in box_cells) > MAX_CELLS:
+            break
+
+        cells = {cell for _, box in box_cells for cell in box}
+
+    return cells
+
+
+def haversine_km(lat: float, lng: float, other_lat: float, other_lng: float):
+    """Get the great-circle distance in kilometers between two
+    coordinates."""
+    lat, lng, other_lat, other_lng = map(
+        math.radians, (lat, lng, other_lat, other_lng)
+    )
+
+    a = (
+        math.sin((other_lat - lat) / 2) ** 2
+        + math.cos(lat)
+        * math.cos(other_lat)
+        * math.sin((other_lng - lng) / 2) ** 2
+    )
+
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
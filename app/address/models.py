@@ -2,6 +2,7 @@ import sqlalchemy as sa
 from sqlalchemy import and_, event
 from sqlalchemy.orm import backref, foreign, relationship, remote
 
+from app.address.geo import encode_geohash
 from app.core.models import ModelMixin
 from app.database import Base
 
@@ -27,6 +28,8 @@ class Address(Base, ModelMixin):
     complement = sa.Column(sa.String, nullable=True)
     lat = sa.Column(sa.Float, nullable=True)
     lng = sa.Column(sa.Float, nullable=True)
+    geohash = sa.Column(sa.String(12), nullable=True, index=True)
+    """Geohash of the coordinates, maintained on insert and update."""
 
     discriminator = sa.Column(sa.String)
     """Refers to the type of parent."""
@@ -37,6 +40,21 @@ class Address(Base, ModelMixin):
     This could refer to any table.
     """
 
+    __table_args__ = (
+        sa.Index(
+            "ix_address_addresses_discriminator_parent_id",
+            "discriminator",
+            "parent_id",
+        ),
+        sa.Index(
+            "ix_address_addresses_is_default",
+            "discriminator",
+            "parent_id",
+            postgresql_where=is_default,
+            sqlite_where=is_default,
+        ),
+    )
+
     @property
     def parent(self):
         """Provides in-Python access to the "parent" by choosing
@@ -54,6 +72,25 @@ class Address(Base, ModelMixin):
         )
 
 
+@event.listens_for(Address, "before_insert")
+@event.listens_for(Address, "before_update")
+def set_geohash(mapper, connection, target):
+    """Keep the geohash in sync with the coordinates of the address."""
+    target.geohash = get_geohash(target.lat, target.lng)
+
+
+def get_geohash(lat, lng):
+    """Get the geohash of the coordinates of an address, if any.
+
+    Addresses inserted or updated with Core statements skip
+    :func:`set_geohash`, their geohash must be set with it.
+    """
+    if lat is None or lng is None:
+        return None
+
+    return encode_geohash(float(lat), float(lng))
+
+
 class HasAddresses(object):
     """HasAddresses mixin, creates a new address_association
     table for each parent.
@@ -75,7 +112,7 @@ def setup_listener(mapper, class_):
             "parent_%s" % discriminator,
             primaryjoin=remote(class_.id) == foreign(Address.parent_id),
         ),
-        lazy="subquery",
+        lazy="select",
         cascade="all, delete",
     )
 
@@ -42,3 +42,20 @@ class Address(AddressBase):
 
 class AddressPagination(PaginationSchema):
     items: List[Address]
+
+
+class AddressBatchUpdate(AddressUpdate):
+    id: int
+
+
+class AddressBatch(SchemaBase):
+    create: List[AddressCreate] = []
+    update: List[AddressBatchUpdate] = []
+    delete: List[int] = []
+
+
+class AddressBatchResult(SchemaBase):
+    created: int
+    updated: int
+    deleted: int
+    items: List[Address]
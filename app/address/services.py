@@ -1,12 +1,18 @@
+from collections import defaultdict
 from typing import Optional
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import bindparam
+from sqlalchemy import delete as sa_delete
+from sqlalchemy import insert
+from sqlalchemy import update as sa_update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.sql.selectable import Select
 
-from app.address.models import Address
-from app.address.schemas import AddressCreate, AddressUpdate
+from app.address.models import Address, get_geohash
+from app.address.schemas import AddressBatch, AddressCreate, AddressUpdate
 
 
 async def create(
@@ -31,6 +37,14 @@ async def create(
     return address
 
 
+def select_by_parent(*, parent_id: int, discriminator: str) -> Select:
+    """Select the addresses of a parent."""
+    return select(Address).where(
+        Address.discriminator == discriminator,
+        Address.parent_id == parent_id,
+    )
+
+
 async def get(
     *,
     session: AsyncSession,
@@ -46,7 +60,6 @@ async def get(
         )
     )
     address = query.scalar_one_or_none()
-    await session.commit()
 
     return address
 
@@ -71,3 +84,101 @@ async def delete(*, session: AsyncSession, address: Address):
     """Delete a address."""
     await session.delete(address)
     await session.commit()
+
+
+async def batch(
+    *, session: AsyncSession, batch_in: AddressBatch, parent: BaseModel
+):
+    """Create, update and delete addresses of a parent in a single
+    transaction, with one statement for each kind of change.
+
+    The updates setting the same fields share an ``executemany`` UPDATE.
+    The changes are applied with Core statements, which skip the ORM
+    listeners, so the geohash of the addresses is set here.
+    """
+    table = Address.__table__
+    discriminator = parent.__class__.__name__.lower()
+
+    if batch_in.delete:
+        await session.execute(
+            sa_delete(table).where(
+                table.c.id.in_(batch_in.delete),
+                table.c.parent_id == parent.id,
+                table.c.discriminator == discriminator,
+            )
+        )
+
+    updates = [
+        address_in.dict(exclude_unset=True) for address_in in batch_in.update
+    ]
+    await _update_addresses(session=session, updates=updates)
+
+    creates = [
+        {
+            **address_in.dict(),
+            "geohash": get_geohash(address_in.lat, address_in.lng),
+            "parent_id": parent.id,
+            "discriminator": discriminator,
+        }
+        for address_in in batch_in.create
+    ]
+    if creates:
+        await session.execute(insert(table), creates)
+
+    query = await session.execute(
+        select_by_parent(
+            parent_id=parent.id, discriminator=discriminator
+        ).execution_options(populate_existing=True)
+    )
+    addresses = query.scalars().all()
+
+    await session.commit()
+
+    return {
+        "created": len(creates),
+        "updated": len(updates),
+        "deleted": len(batch_in.delete),
+        "items": addresses,
+    }
+
+
+async def _update_addresses(*, session: AsyncSession, updates: list):
+    table = Address.__table__
+
+    # The geohash depends on both coordinates, the current ones are read
+    # for the addresses which update only one of them.
+    moved = {
+        values["id"]: values
+        for values in updates
+        if "lat" in values or "lng" in values
+    }
+    if moved:
+        query = await session.execute(
+            select(table.c.id, table.c.lat, table.c.lng).where(
+                table.c.id.in_(moved)
+            )
+        )
+        for row in query:
+            values = moved[row.id]
+            values["geohash"] = get_geohash(
+                values.get("lat", row.lat), values.get("lng", row.lng)
+            )
+
+    groups = defaultdict(list)
+    for values in updates:
+        groups[tuple(sorted(set(values) - {"id"}))].append(values)
+
+    for fields, rows in groups.items():
+        if not fields:
+            continue
+
+        # The bound parameters can not be named after the columns set.
+        await session.execute(
+            sa_update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({field: bindparam("_" + field) for field in fields}),
+            [
+                {"_" + field: value for field, value in values.items()}
+                for values in rows
+            ],
+        )
@@ -0,0 +1,59 @@
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.address.models import Address as AddressModel
+from app.address.schemas import AddressBatch
+
+
+async def validate_address_batch(
+    *, session: AsyncSession, batch_in: AddressBatch, parent: BaseModel
+):
+    """Validate that the addresses updated and deleted by a batch belong
+    to ``parent``, each of them at most once."""
+    locs = [
+        (["body", "update", index, "id"], address_in.id)
+        for index, address_in in enumerate(batch_in.update)
+    ] + [
+        (["body", "delete", index], address_id)
+        for index, address_id in enumerate(batch_in.delete)
+    ]
+
+    if not locs:
+        return
+
+    query = await session.execute(
+        select(AddressModel.id).where(
+            AddressModel.id.in_({address_id for _, address_id in locs}),
+            AddressModel.parent_id == parent.id,
+            AddressModel.discriminator == parent.__class__.__name__.lower(),
+        )
+    )
+    address_ids = set(query.scalars().all())
+
+    detail, seen = [], set()
+    for loc, address_id in locs:
+        if address_id not in address_ids:
+            detail.append(
+                {
+                    "loc": loc,
+                    "msg": "address not found",
+                    "type": "value_error.not_found",
+                }
+            )
+        elif address_id in seen:
+            detail.append(
+                {
+                    "loc": loc,
+                    "msg": "address already in the batch",
+                    "type": "value_error.duplicate",
+                }
+            )
+
+        seen.add(address_id)
+
+    if detail:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
+        )
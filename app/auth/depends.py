@@ -1,21 +1,54 @@
+import hashlib
+from time import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from app.auth.revocation import REVOKED_TOKENS
+from app.auth.services import cache_user, decode_access_token, get_cached_user
 from app.config import get_settings
+from app.core.cache import LRUCache
+from app.core.metrics import TOKEN_CLAIMS_CACHE_LOOKUPS
 from app.depends import get_session
 from app.user.models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+TOKEN_CLAIMS = LRUCache(maxsize=get_settings().TOKEN_CLAIMS_CACHE_SIZE)
+"""
+Validated claims of the access tokens, keyed by the SHA-256 digest of the
+token, each one until the token expires.
+"""
+
+
+def get_token_claims(token: str) -> dict:
+    """Get the claims of an access token, decoding and verifying it only
+    when they are not cached, raise ``JWTError`` when it is not valid."""
+    key = hashlib.sha256(token.encode()).digest()
+
+    claims = TOKEN_CLAIMS.get(key)
+    if claims is not None:
+        TOKEN_CLAIMS_CACHE_LOOKUPS.labels("hit").inc()
+        return dict(claims)
+
+    TOKEN_CLAIMS_CACHE_LOOKUPS.labels("miss").inc()
+    claims = decode_access_token(token)
+
+    # The tokens without an expiration are verified on every request.
+    expires_in = claims.get("exp", 0) - time()
+    if expires_in > 0:
+        TOKEN_CLAIMS.set(key, claims, ttl=expires_in)
+
+    return dict(claims)
+
 
 async def current_user(
     token: str = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_session),
 ):
-    settings = get_settings()
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -23,21 +56,32 @@ async def current_user(
     )
 
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = get_token_claims(token)
         username: str = payload.get("sub")
+        issued_at = payload.get("iat")
         if username is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    # The tokens issued before they had an identifier can not be revoked.
+    jti = payload.get("jti")
+    if jti is not None and await REVOKED_TOKENS.is_revoked(
+        session=session, jti=jti
+    ):
+        raise credentials_exception
+
+    user = await get_cached_user(session=session, sub=username, iat=issued_at)
+    if user is not None:
+        return user
+
     query = await session.execute(select(User).filter_by(email=username))
     user = query.scalar_one_or_none()
-    await session.commit()
 
     if user is None:
         raise credentials_exception
+
+    cache_user(user, sub=username, iat=issued_at)
     return user
 
 
@@ -0,0 +1,102 @@
+from datetime import datetime
+from time import monotonic
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.config import get_settings
+from app.core.bloom import BloomFilter
+from app.core.metrics import TOKEN_REVOCATION_LOOKUPS
+from app.user.models import RevokedToken
+
+
+class RevocationFilter(object):
+    """Tell whether an access token is revoked, by its ``jti``, without a
+    query for the tokens which are not.
+
+    The revoked tokens are kept in the database and in a Bloom filter,
+    rebuilt from it every ``refresh_seconds``. The database is only
+    queried when the filter matches, to rule out its false positives.
+    The tokens revoked by another process are therefore only seen by this
+    one once its filter is rebuilt.
+    """
+
+    def __init__(self, capacity, error_rate, refresh_seconds):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.refreshed_at = None
+
+    def is_stale(self):
+        return (
+            self.refreshed_at is None
+            or monotonic() - self.refreshed_at >= self.refresh_seconds
+        )
+
+    async def rebuild(self, *, session: AsyncSession):
+        """Rebuild the filter with the tokens revoked which are not
+        expired yet."""
+        # Set first, so that concurrent requests do not rebuild it too.
+        self.refreshed_at = monotonic()
+
+        query = await session.execute(
+            select(RevokedToken.jti).where(
+                RevokedToken.expire_at >= datetime.utcnow()
+            )
+        )
+        jtis = query.scalars().all()
+
+        bloom = BloomFilter(max(self.capacity, len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+
+        self.bloom = bloom
+
+        return bloom
+
+    def add(self, jti: str):
+        self.bloom.add(jti)
+
+    async def is_revoked(self, *, session: AsyncSession, jti: str):
+        if self.is_stale():
+            await self.rebuild(session=session)
+
+        if jti not in self.bloom:
+            TOKEN_REVOCATION_LOOKUPS.labels("miss").inc()
+            return False
+
+        query = await session.execute(
+            select(func.count()).where(RevokedToken.jti == jti)
+        )
+        is_revoked = bool(query.scalar_one())
+
+        TOKEN_REVOCATION_LOOKUPS.labels(
+            "revoked" if is_revoked else "false_positive"
+        ).inc()
+
+        return is_revoked
+
+    def clear(self):
+        """Empty the filter, which is rebuilt on the next lookup."""
+        self.bloom = BloomFilter(self.capacity, self.error_rate)
+        self.refreshed_at = None
+
+
+REVOKED_TOKENS = RevocationFilter(
+    capacity=get_settings().REVOCATION_FILTER_CAPACITY,
+    error_rate=get_settings().REVOCATION_FILTER_ERROR_RATE,
+    refresh_seconds=get_settings().REVOCATION_FILTER_REFRESH_SECONDS,
+)
+"""Revocation filter of the access tokens of this process."""
+
+
+async def revoke_access_token(
+    *, session: AsyncSession, jti: str, expire_at: datetime, user_id=None
+):
+    """Revoke an access token until it expires, at ``expire_at`` UTC."""
+    session.add(RevokedToken(jti=jti, expire_at=expire_at, user_id=user_id))
+    await session.commit()
+
+    REVOKED_TOKENS.add(jti)
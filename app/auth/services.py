@@ -1,11 +1,31 @@
+import hashlib
+from copy import deepcopy
 from datetime import datetime, timedelta
+from secrets import token_urlsafe
+from typing import Optional
+from uuid import uuid4
 
 from jose import jwt
+from sqlalchemy import inspect, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.address.models import Address
 from app.config import get_settings
-from app.user.models import User
+from app.core.cache import LRUCache
+from app.user.hashers import verify_password
+from app.user.models import RefreshToken, User
+
+CURRENT_USERS = LRUCache(
+    maxsize=get_settings().CURRENT_USER_CACHE_SIZE,
+    ttl=get_settings().CURRENT_USER_CACHE_TTL,
+)
+"""
+Snapshots of the authenticated users, keyed by the `sub` and `iat` claims
+of their token.
+"""
 
 
 async def authenticate_user(
@@ -13,12 +33,30 @@ async def authenticate_user(
 ):
     query = await session.execute(select(User).filter_by(email=username))
     user = query.scalar_one_or_none()
-    await session.commit()
 
-    if user is not None and user.check_password(password):
-        return user
+    if user is None:
+        return False
+
+    is_valid, password_hash = await verify_password(password, user.password)
+    if not is_valid:
+        return False
+
+    # Passwords hashed with a legacy hasher or cost are hashed again with
+    # the current one, now that they are known.
+    if password_hash is not None:
+        user.set_password_hash(*password_hash)
+        await session.commit()
 
-    return False
+    return user
+
+
+def decode_access_token(token: str) -> dict:
+    """Decode the claims of an access token, raise ``JWTError`` when it is
+    not valid."""
+    settings = get_settings()
+    return jwt.decode(
+        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+    )
 
 
 async def create_access_token(user: User):
@@ -26,10 +64,146 @@ async def create_access_token(user: User):
     access_token_expires = timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    to_encode = {"sub": user.email}
-    expire = datetime.utcnow() + access_token_expires
+    issued_at = datetime.utcnow()
+    to_encode = {"sub": user.email, "iat": issued_at, "jti": uuid4().hex}
+    expire = issued_at + access_token_expires
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
     return {"access_token": encoded_jwt, "token_type": "bearer"}
+
+
+def hash_refresh_token(token: str) -> str:
+    """Hash a refresh token, random enough for a single SHA-256 round."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def create_refresh_token(*, session: AsyncSession, user: User) -> str:
+    """Create a refresh token of ``user``, only its hash is stored."""
+    settings = get_settings()
+    token = token_urlsafe(48)
+
+    session.add(
+        RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(token),
+            expire_at=datetime.now()
+            + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+    )
+    await session.commit()
+
+    return token
+
+
+async def rotate_refresh_token(*, session: AsyncSession, token: str):
+    """Exchange a refresh token for a new one, return the user of the
+    token along with the new token, or ``None`` if it is not valid.
+
+    A token is valid once, presenting a rotated or revoked token again
+    revokes every token of its user, as it may have been stolen.
+    """
+    query = await session.execute(
+        select(RefreshToken, User)
+        .join(User, RefreshToken.user_id == User.id)
+        .where(RefreshToken.token_hash == hash_refresh_token(token))
+    )
+    row = query.one_or_none()
+
+    if row is None:
+        return None
+
+    refresh_token, user = row
+
+    if refresh_token.revoked_at is not None:
+        await revoke_refresh_tokens(session=session, user_id=user.id)
+        await session.commit()
+        return None
+
+    if refresh_token.expire_at < datetime.now():
+        return None
+
+    # The token is revoked only if it still is not, so that it is rotated
+    # once when it is presented by concurrent requests.
+    result = await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.id == refresh_token.id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.now())
+    )
+    if result.rowcount != 1:
+        return None
+
+    return user, await create_refresh_token(session=session, user=user)
+
+
+async def revoke_refresh_token(*, session: AsyncSession, token: str):
+    """Revoke a refresh token, if it exists."""
+    await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.now())
+    )
+    await session.commit()
+
+
+async def revoke_refresh_tokens(*, session: AsyncSession, user_id: int):
+    """Revoke every refresh token of a user.
+
+    The session is not committed, the caller owns the transaction.
+    """
+    await session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.now())
+    )
+
+
+def cache_user(user: User, sub: str, iat: Optional[int]):
+    """Keep a snapshot of the authenticated user of a token."""
+    snapshot = {"user": user.dict(), "addresses": None}
+
+    if "addresses" not in inspect(user).unloaded:
+        snapshot["addresses"] = [address.dict() for address in user.addresses]
+
+    CURRENT_USERS.set((sub, iat), snapshot)
+
+
+async def get_cached_user(
+    *, session: AsyncSession, sub: str, iat: Optional[int]
+) -> Optional[User]:
+    """Get the cached user of a token, merged into the session without
+    emitting any query."""
+    snapshot = CURRENT_USERS.get((sub, iat))
+
+    if snapshot is None:
+        return None
+
+    user = User(**deepcopy(snapshot["user"]))
+    make_transient_to_detached(user)
+
+    if snapshot["addresses"] is not None:
+        addresses = [
+            Address(**address) for address in deepcopy(snapshot["addresses"])
+        ]
+        for address in addresses:
+            make_transient_to_detached(address)
+
+        # Set as loaded from the database, without firing the backrefs.
+        set_committed_value(user, "addresses", addresses)
+
+    return await session.merge(user, load=False)
+
+
+def invalidate_user(email: str):
+    """Drop the cached snapshots of a user, whatever token they came from."""
+    CURRENT_USERS.evict(lambda key: key[0] == email)
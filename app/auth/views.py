@@ -1,29 +1,136 @@
 import logging
+from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Form, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import services
+from app.auth.depends import current_user, get_token_claims, oauth2_scheme
+from app.auth.revocation import revoke_access_token
 from app.auth.schemas import Token
 from app.depends import get_session
+from app.user.models import User
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+class OAuth2TokenRequestForm(OAuth2PasswordRequestForm):
+    """Form of the password and refresh token grants of the token
+    endpoint."""
+
+    def __init__(
+        self,
+        grant_type: str = Form(None, regex="^(password|refresh_token)$"),
+        username: str = Form(None),
+        password: str = Form(None),
+        refresh_token: str = Form(None),
+        scope: str = Form(""),
+        client_id: str = Form(None),
+        client_secret: str = Form(None),
+    ):
+        super().__init__(
+            grant_type=grant_type,
+            username=username,
+            password=password,
+            scope=scope,
+            client_id=client_id,
+            client_secret=client_secret,
+        )
+        self.refresh_token = refresh_token
+
+
 @router.post("/token", response_model=Token, summary="Create token.")
 async def create_token(
-    form_data: OAuth2PasswordRequestForm = Depends(),
+    form_data: OAuth2TokenRequestForm = Depends(),
     session: AsyncSession = Depends(get_session),
 ):
-    user = await services.authenticate_user(
-        session, form_data.username, form_data.password
-    )
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
+    if form_data.grant_type == "refresh_token":
+        result = None
+        if form_data.refresh_token:
+            result = await services.rotate_refresh_token(
+                session=session, token=form_data.refresh_token
+            )
+
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid refresh token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        user, refresh_token = result
+        logger.info(
+            "Token refreshed successfully with={}".format(
+                {"user_id": user.id}
+            )
+        )
+    else:
+        user = await services.authenticate_user(
+            session, form_data.username or "", form_data.password or ""
+        )
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        refresh_token = await services.create_refresh_token(
+            session=session, user=user
+        )
+
+    token = await services.create_access_token(user=user)
+    return {**token, "refresh_token": refresh_token}
+
+
+@router.post(
+    "/token/revoke",
+    summary="Revoke refresh token.",
+    status_code=status.HTTP_200_OK,
+)
+async def revoke_token(
+    token: str = Form(...),
+    session: AsyncSession = Depends(get_session),
+):
+    # Unknown tokens are not reported, as in RFC 7009.
+    await services.revoke_refresh_token(session=session, token=token)
+
+    return JSONResponse(status_code=status.HTTP_200_OK, content={})
+
+
+@router.post(
+    "/logout",
+    summary="Revoke the access token, and the refresh token if given.",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    refresh_token: str = Form(None),
+    session: AsyncSession = Depends(get_session),
+    user: User = Depends(current_user),
+):
+    payload = get_token_claims(token)
+
+    if payload.get("jti") is not None:
+        await revoke_access_token(
+            session=session,
+            jti=payload["jti"],
+            expire_at=datetime.utcfromtimestamp(payload["exp"]),
+            user_id=user.id,
+        )
+
+    if refresh_token:
+        await services.revoke_refresh_token(
+            session=session, token=refresh_token
         )
-    return await services.create_access_token(user=user)
+
+    logger.info(
+        "Logout successfully with={}".format(
+            {"user_id": user.id, "jti": payload.get("jti")}
+        )
+    )
+
+    return JSONResponse(status_code=status.HTTP_204_NO_CONTENT)
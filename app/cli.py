@@ -1,5 +1,7 @@
 import typer
 
+from app.core.commands import index as index_core
+from app.core.commands import revocation as revocation_core
 from app.core.commands import route as route_core
 
 cli = typer.Typer()
@@ -9,6 +11,16 @@ cli.add_typer(
     name="route",
     help="Manager for all application route commands.",
 )
+cli.add_typer(
+    index_core,
+    name="index",
+    help="Manager for all database index commands.",
+)
+cli.add_typer(
+    revocation_core,
+    name="revocation",
+    help="Manager for all token revocation commands.",
+)
 
 if __name__ == "__main__":
     cli()
@@ -1,6 +1,8 @@
 from functools import lru_cache
+from importlib.util import find_spec
+from typing import Literal, Optional
 
-from pydantic import BaseSettings
+from pydantic import BaseSettings, validator
 
 
 class Settings(BaseSettings):
@@ -11,10 +13,40 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     DEFAULT_ITEMS_PER_PAGE: int = 5
     MAX_ITEMS_PER_PAGE: int = 25
+    NEARBY_MAX_CANDIDATES: int = 1000
+    EXPORT_CHUNK_SIZE: int = 500
+    BULK_CHUNK_SIZE: int = 500
+    BULK_MAX_ITEMS: int = 5000
+    FILTER_TRACE_ENABLE: bool = False
+    QUERY_STATS_ENABLE: bool = False
+    METRICS_ENABLE: bool = True
     SQLALCHEMY_WARN_20: int = 1
     ITEMS_PER_USER: int = 50
+    UNIQUE_VALIDATION: Literal["query", "constraint"] = "query"
     SQLALCHEMY_DATABASE_URI: str
+    SQLALCHEMY_READ_DATABASE_URI: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 10
+    SQLALCHEMY_ECHO: bool = False
+    SQLALCHEMY_POOL_SIZE: int = 5
+    SQLALCHEMY_MAX_OVERFLOW: int = 10
+    SQLALCHEMY_POOL_TIMEOUT: int = 30
+    SQLALCHEMY_POOL_RECYCLE: int = 1800
+    SQLALCHEMY_POOL_PRE_PING: bool = True
+    SQLALCHEMY_POOL_WARM_UP: bool = True
+    SQLALCHEMY_STATEMENT_CACHE_SIZE: int = 100
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    REVOCATION_FILTER_CAPACITY: int = 100000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_FILTER_REFRESH_SECONDS: int = 60
+    PASSWORD_HASHER: Literal["scrypt", "crypt"] = "scrypt"
+    PASSWORD_SCRYPT_N: int = 16384
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    PASSWORD_HASH_WORKERS: int = 4
+    CURRENT_USER_CACHE_SIZE: int = 1024
+    CURRENT_USER_CACHE_TTL: int = 60
+    TOKEN_CLAIMS_CACHE_SIZE: int = 4096
     ACCOUNT_EMAIL_VERIFY_ENABLE: bool = True
     TESTING: bool = False
     ALGORITHM: str = "HS256"
@@ -32,6 +64,14 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "sqla+sqlite:///instance/database.db"
     CELERY_RESULT_BACKEND: str = "db+sqlite:///instance/database.db"
 
+    @validator("PASSWORD_HASHER")
+    def validate_password_hasher(cls, value):
+        # The crypt module was removed in Python 3.13.
+        if value == "crypt" and find_spec("crypt") is None:
+            raise ValueError("crypt is not available on this Python")
+
+        return value
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,55 @@
+import hashlib
+import math
+
+
+class BloomFilter(object):
+    """A Bloom filter of strings, sized for ``capacity`` items with a
+    false positive rate of ``error_rate``.
+
+    It tells whether an item may have been added, or surely was not.
+    """
+
+    def __init__(self, capacity=1000, error_rate=0.01):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8,
+            math.ceil(
+                -capacity * math.log(error_rate) / math.log(2) ** 2
+            ),
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def _get_positions(self, item: str):
+        # The positions are derived from two halves of a single digest, by
+        # double hashing.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+
+        return [
+            (first + i * second) % self.size for i in range(self.hash_count)
+        ]
+
+    def add(self, item: str):
+        for position in self._get_positions(item):
+            self._bits[position // 8] |= 1 << (position % 8)
+
+        self.count += 1
+
+    def __contains__(self, item: str):
+        return all(
+            self._bits[position // 8] & (1 << (position % 8))
+            for position in self._get_positions(item)
+        )
+
+    def __len__(self):
+        return self.count
+
+    def false_positive_rate(self):
+        """Return the expected false positive rate for the items added."""
+        return (
+            1 - math.exp(-self.hash_count * self.count / self.size)
+        ) ** self.hash_count
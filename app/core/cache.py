@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+
+class LRUCache(object):
+    """A size-bounded, thread-safe, least recently used cache.
+
+    Entries may optionally expire ``ttl`` seconds after being stored.
+    Keeps track of hits and misses so that its effectiveness can be
+    reported, see :meth:`info`.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the value of ``key``, marking it as recently used."""
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires_at is not None and expires_at <= monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store ``value`` under ``key``, evicting the oldest entry when
+        the cache is full.
+
+        The entry expires after ``ttl`` seconds when given, instead of the
+        ``ttl`` of the cache.
+        """
+        ttl = self.ttl if ttl is None else ttl
+
+        expires_at = None
+        if ttl is not None:
+            expires_at = monotonic() + ttl
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove ``key`` from the cache and return its value."""
+        with self._lock:
+            value, _ = self._data.pop(key, (default, None))
+            return value
+
+    def evict(self, predicate):
+        """Remove the entries whose key satisfies ``predicate``, returning
+        how many were removed."""
+        with self._lock:
+            keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+
+            return len(keys)
+
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        """Return the statistics of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self):
+        return len(self._data)
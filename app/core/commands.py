@@ -1,7 +1,16 @@
+import asyncio
+import os
+from urllib.parse import urlparse
+from urllib.request import urlopen
+from uuid import uuid4
+
 import typer
+from sqlalchemy import inspect
 from tabulate import tabulate
 
 route = typer.Typer()
+index = typer.Typer()
+revocation = typer.Typer()
 
 
 @route.command(help="Prints all available routes.")
@@ -21,3 +30,221 @@ def show():
     typer.secho(
         tabulate(table, headers=["Name", "Path", "Authenticated", "Methods"])
     )
+
+
+def read_metrics(url: str = None):
+    """Read the metrics in the Prometheus text format of a running
+    instance, from its metrics ``url`` or, without one, from the
+    ``PROMETHEUS_MULTIPROC_DIR`` its workers write to.
+
+    Return ``None`` when there are neither, as the metrics of this process
+    would be empty.
+    """
+    from app.core.metrics import get_metrics
+
+    if url is None:
+        if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+            return None
+
+        return get_metrics()[0].decode()
+
+    if urlparse(url).scheme not in ("http", "https"):
+        raise typer.BadParameter(
+            "Only http and https URLs are supported.", param_hint="--url"
+        )
+
+    # The scheme is checked above, so that no local file is opened.
+    with urlopen(url) as response:  # nosec B310
+        return response.read().decode()
+
+
+def get_filter_field_usage(metrics: str):
+    """Get the uses of each ``(table, field)`` by the generic filters from
+    metrics in the Prometheus text format."""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    usage = {}
+    for family in text_string_to_metric_families(metrics):
+        if family.name != "filter_field_usage":
+            continue
+
+        for sample in family.samples:
+            if sample.name == "filter_field_usage_total":
+                key = (sample.labels["table"], sample.labels["field"])
+                usage[key] = usage.get(key, 0) + int(sample.value)
+
+    return usage
+
+
+def get_indexed_columns(connection, table_names):
+    """Get, for each table, the columns covered by an index, a unique
+    constraint or the primary key, as the name of the one where the column
+    comes first along with its position in it."""
+    inspector = inspect(connection)
+
+    indexed_columns = {}
+    for table_name in table_names:
+        primary_key = inspector.get_pk_constraint(table_name)
+        constraints = [
+            (
+                primary_key.get("name") or "primary key",
+                primary_key["constrained_columns"],
+            )
+        ]
+        constraints += [
+            (item["name"], item["column_names"])
+            for item in inspector.get_indexes(table_name)
+        ]
+        constraints += [
+            (item["name"] or "unique", item["column_names"])
+            for item in inspector.get_unique_constraints(table_name)
+        ]
+
+        indexed_columns[table_name] = {}
+        for name, columns in constraints:
+            for position, column in enumerate(columns):
+                current = indexed_columns[table_name].get(column)
+                if current is None or position < current[1]:
+                    indexed_columns[table_name][column] = (name, position)
+
+    return indexed_columns
+
+
+async def _get_indexed_columns(table_names):
+    from app.database import engine
+
+    async with engine.connect() as connection:
+        indexed_columns = await connection.run_sync(
+            get_indexed_columns, table_names
+        )
+
+    await engine.dispose()
+
+    return indexed_columns
+
+
+@index.command(
+    help="Prints the fields most used by the generic filters and the "
+    "indexes supporting them."
+)
+def filters(
+    url: str = typer.Option(
+        None,
+        help="Metrics URL of a running instance, required unless "
+        "PROMETHEUS_MULTIPROC_DIR is set.",
+    ),
+    limit: int = typer.Option(20, help="Number of fields to print."),
+):
+    metrics = read_metrics(url)
+    if metrics is None:
+        raise typer.BadParameter(
+            "Required unless PROMETHEUS_MULTIPROC_DIR is set, the metrics "
+            "of this process are empty.",
+            param_hint="--url",
+        )
+
+    usage = sorted(
+        get_filter_field_usage(metrics).items(),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:limit]
+
+    indexed_columns = asyncio.run(
+        _get_indexed_columns({table_name for (table_name, _), _ in usage})
+    )
+
+    table, missing = [], 0
+    for (table_name, field), uses in usage:
+        index_name, position = indexed_columns[table_name].get(
+            field, ("-", 0)
+        )
+        if index_name == "-":
+            missing += 1
+        elif position:
+            # Only used along with the columns which come before it.
+            index_name = "{} (column {})".format(index_name, position + 1)
+
+        table.append([table_name, field, uses, index_name])
+
+    typer.secho(tabulate(table, headers=["Table", "Field", "Uses", "Index"]))
+    typer.secho(
+        "{} of {} fields without a supporting index.".format(
+            missing, len(table)
+        ),
+        fg=typer.colors.YELLOW if missing else typer.colors.GREEN,
+    )
+
+
+def get_token_revocation_lookups(metrics: str):
+    """Get the lookups of the revocation filter by result from metrics in
+    the Prometheus text format."""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    lookups = {}
+    for family in text_string_to_metric_families(metrics):
+        if family.name != "token_revocation_lookups":
+            continue
+
+        for sample in family.samples:
+            if sample.name == "token_revocation_lookups_total":
+                result = sample.labels["result"]
+                lookups[result] = lookups.get(result, 0) + int(sample.value)
+
+    return lookups
+
+
+async def _build_revocation_filter():
+    from app.auth.revocation import REVOKED_TOKENS
+    from app.database import async_session, engine
+
+    async with async_session() as session:
+        bloom = await REVOKED_TOKENS.rebuild(session=session)
+
+    await engine.dispose()
+
+    return bloom
+
+
+@revocation.command(
+    help="Builds the revocation filter of the access tokens from the "
+    "database, as the running instances do, and prints its false positive "
+    "rate."
+)
+def rebuild(
+    url: str = typer.Option(
+        None,
+        help="Metrics URL of a running instance, to print the false positive "
+        "rate of its lookups, read from PROMETHEUS_MULTIPROC_DIR otherwise.",
+    ),
+    probes: int = typer.Option(
+        10000,
+        help="Random token ids looked up to measure the false positive rate.",
+    ),
+):
+    bloom = asyncio.run(_build_revocation_filter())
+
+    false_positives = sum(uuid4().hex in bloom for _ in range(probes))
+
+    metrics = read_metrics(url)
+
+    # Only the lookups of tokens which are not revoked can be false
+    # positives.
+    lookups = {}
+    if metrics is not None:
+        lookups = get_token_revocation_lookups(metrics)
+    negatives = lookups.get("miss", 0) + lookups.get("false_positive", 0)
+
+    table = [
+        ["Revoked tokens", len(bloom)],
+        ["Capacity", bloom.capacity],
+        ["Bits", bloom.size],
+        ["Hashes", bloom.hash_count],
+        ["Expected false positive rate", bloom.false_positive_rate()],
+        ["Measured false positive rate", false_positives / probes],
+        [
+            "Observed false positive rate",
+            lookups.get("false_positive", 0) / negatives if negatives else "-",
+        ],
+    ]
+
+    typer.secho(tabulate(table, headers=["Filter", "Value"]))
@@ -1,11 +1,10 @@
 import json
+from typing import List, Literal
 
-from fastapi import Query
+from fastapi import Depends, Query
 
 
-def pagination_parameters(
-    page: int = 1,
-    items_per_page: int = Query(5, alias="itemsPerPage"),
+def search_parameters(
     filter_spec: str = Query(
         [],
         alias="filter",
@@ -18,6 +17,12 @@ def pagination_parameters(
         description="Dynamic sorts based on JSON format.",
         example='[{"field":"foo", "direction":"asc"}]',
     ),
+    fields: str = Query(
+        None,
+        description="Comma separated fields of the items to return, "
+        "all of them are returned otherwise.",
+        example="id,title,image",
+    ),
 ):
     if filter_spec:
         filter_spec = json.loads(filter_spec)
@@ -25,9 +30,61 @@ def pagination_parameters(
     if sort_spec:
         sort_spec = json.loads(sort_spec)
 
+    if fields:
+        # The id identifies the items, it is always returned.
+        fields = ["id"] + [
+            field for field in fields.split(",") if field and field != "id"
+        ]
+
     return {
-        "page": page,
-        "items_per_page": items_per_page,
         "filter_spec": filter_spec,
         "sort_spec": sort_spec,
+        "fields": fields,
+    }
+
+
+def pagination_parameters(
+    page: int = 1,
+    items_per_page: int = Query(5, alias="itemsPerPage"),
+    cursor: str = Query(
+        None,
+        description="Opaque cursor returned as `next_cursor` or "
+        "`prev_cursor` by a previous page, used instead of `page`.",
+    ),
+    count: Literal["exact", "estimate", "none", "window"] = Query(
+        "exact",
+        description="How the total is obtained: `exact` counts the rows, "
+        "`window` counts them in the same query as the page, `estimate` "
+        "uses the database planner estimate and `none` skips the count, "
+        "returning `total` as null.",
+    ),
+    search: dict = Depends(search_parameters),
+):
+    return {
+        "page": page,
+        "items_per_page": items_per_page,
+        "cursor": cursor,
+        "count": count,
+        **search,
     }
+
+
+def export_parameters(
+    export_format: Literal["ndjson", "csv"] = Query(
+        "ndjson",
+        alias="format",
+        description="Format of the export, newline delimited JSON or CSV.",
+    ),
+    search: dict = Depends(search_parameters),
+):
+    return {"export_format": export_format, **search}
+
+
+def include_parameters(
+    include: List[Literal["addresses"]] = Query(
+        [],
+        description="Relationships loaded and returned along with the "
+        "items, which are left out otherwise.",
+    ),
+):
+    return include
@@ -26,4 +26,6 @@ class BadQuery(Exception):
 
 
 class InvalidPage(Exception):
-    pass
+    def __init__(self, message, param="cursor"):
+        super().__init__(message)
+        self.param = param
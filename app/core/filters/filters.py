@@ -1,15 +1,26 @@
-import pprint
+import logging
 from collections import namedtuple
 from collections.abc import Iterable
 from inspect import signature
 from itertools import chain
+from time import perf_counter
 
 from six import string_types
 from sqlalchemy import and_, func, not_, or_
 from sqlalchemy.sql.selectable import Select
 
+from app.core.cache import LRUCache
+from app.core.metrics import FILTER_FIELD_USAGE
+
 from .exceptions import BadFilterFormat
-from .models import Field, get_default_model, get_model_from_spec
+from .models import (
+    Field,
+    get_default_model,
+    get_model_from_spec,
+    get_query_models,
+)
+
+logger = logging.getLogger(__name__)
 
 BooleanFunction = namedtuple(
     "BooleanFunction", ("key", "sqlalchemy_fn", "only_one_arg")
@@ -23,6 +34,20 @@ BOOLEAN_FUNCTIONS = [
 Sqlalchemy boolean functions that can be parsed from the filter definition.
 """
 
+FilterTrace = namedtuple("FilterTrace", ("where", "params", "compile_time"))
+
+FILTER_TRACE_HOOKS = []
+"""
+Callables registered with :func:`add_filter_trace_hook`, each one is called
+with a :class:`FilterTrace` every time filters are applied.
+"""
+
+FILTER_PLANS = LRUCache(maxsize=256)
+"""
+Filters already built and resolved against the models of a query, keyed by
+the shape of the filter spec, so that only the values change per request.
+"""
+
 
 class Operator(object):
 
@@ -50,6 +75,11 @@ class Operator(object):
         "not_any": lambda f, a: func.not_(f.any(a)),
     }
 
+    ARITIES = {
+        operator: len(signature(function).parameters)
+        for operator, function in OPERATORS.items()
+    }
+
     def __init__(self, operator=None):
         if not operator:
             operator = "=="
@@ -59,7 +89,7 @@ class Operator(object):
 
         self.operator = operator
         self.function = self.OPERATORS[operator]
-        self.arity = len(signature(self.function).parameters)
+        self.arity = self.ARITIES[operator]
 
 
 class Filter(object):
@@ -77,6 +107,7 @@ class Filter(object):
 
         self.operator = Operator(filter_spec.get("op"))
         self.value = filter_spec.get("value")
+        self.sqlalchemy_field = None
         value_present = True if "value" in filter_spec else False
         if not value_present and self.operator.arity == 2:
             raise BadFilterFormat("`value` must be provided.")
@@ -86,19 +117,28 @@ class Filter(object):
             return {self.filter_spec["model"]}
         return set()
 
-    def format_for_sqlalchemy(self, query, default_model):
-        filter_spec = self.filter_spec
+    def format_for_sqlalchemy(self, query, default_model, values=None):
+        """Return the sqlalchemy expression of the filter.
+
+        :param values:
+            An iterator over the values of the filters, in the order
+            they appear in the filter spec, to be used instead of the
+            value the filter was built with.
+        """
         operator = self.operator
-        value = self.value
+        value = self.value if values is None else next(values)
 
-        model = get_model_from_spec(filter_spec, query, default_model)
+        # The field is resolved once, the filter may be reused afterwards.
+        if self.sqlalchemy_field is None:
+            model = get_model_from_spec(
+                self.filter_spec, query, default_model
+            )
+            field = Field(model, self.filter_spec["field"])
+            self.sqlalchemy_field = field.get_sqlalchemy_field()
 
         function = operator.function
         arity = operator.arity
-
-        field_name = self.filter_spec["field"]
-        field = Field(model, field_name)
-        sqlalchemy_field = field.get_sqlalchemy_field()
+        sqlalchemy_field = self.sqlalchemy_field
 
         if arity == 1:
             return function(sqlalchemy_field)
@@ -118,10 +158,10 @@ class BooleanFilter(object):
             models.update(filter.get_named_models())
         return models
 
-    def format_for_sqlalchemy(self, query, default_model):
+    def format_for_sqlalchemy(self, query, default_model, values=None):
         return self.function(
             *[
-                filter.format_for_sqlalchemy(query, default_model)
+                filter.format_for_sqlalchemy(query, default_model, values)
                 for filter in self.filters
             ]
         )
@@ -176,6 +216,87 @@ def build_filters(filter_spec):
     return [Filter(filter_spec)]
 
 
+def get_spec_shape(filter_spec, values):
+    """Return the shape of `filter_spec`, which is the spec without values.
+
+    The values are appended to `values` in the same order in which the
+    filters built by :func:`build_filters` consume them.
+    """
+    if _is_iterable_filter(filter_spec):
+        return tuple(get_spec_shape(item, values) for item in filter_spec)
+
+    if isinstance(filter_spec, dict):
+        for boolean_function in BOOLEAN_FUNCTIONS:
+            if boolean_function.key in filter_spec:
+                return (
+                    boolean_function.key,
+                    get_spec_shape(filter_spec[boolean_function.key], values),
+                )
+
+        values.append(filter_spec.get("value"))
+        return tuple(
+            sorted((k, v) for k, v in filter_spec.items() if k != "value")
+        ) + ("value" in filter_spec,)
+
+    return filter_spec
+
+
+def add_filter_trace_hook(hook):
+    """Register `hook` to be called with a :class:`FilterTrace`, holding
+    the compiled WHERE clause, its bound parameters and the time spent to
+    build and compile it, every time filters are applied.
+
+    While no hook is registered, filters are not traced at all.
+    """
+    if hook not in FILTER_TRACE_HOOKS:
+        FILTER_TRACE_HOOKS.append(hook)
+
+
+def remove_filter_trace_hook(hook):
+    """Unregister a hook added with :func:`add_filter_trace_hook`."""
+    if hook in FILTER_TRACE_HOOKS:
+        FILTER_TRACE_HOOKS.remove(hook)
+
+
+def log_filter_trace(trace):
+    """Filter trace hook which logs the trace with the debug level."""
+    logger.debug(
+        "Filters applied with={}".format(
+            {
+                "where": trace.where,
+                "params": trace.params,
+                "compile_time": trace.compile_time,
+            }
+        )
+    )
+
+
+def _trace_filters(sqlalchemy_filters, started_at):
+    compiled = and_(*sqlalchemy_filters).compile()
+    trace = FilterTrace(
+        str(compiled), compiled.params, perf_counter() - started_at
+    )
+
+    for hook in list(FILTER_TRACE_HOOKS):
+        try:
+            hook(trace)
+        except Exception:
+            logger.exception("Error in filter trace hook {}".format(hook))
+
+
+def count_field_usage(filters):
+    """Count the columns used by `filters`, see `FILTER_FIELD_USAGE`."""
+    for filter in filters:
+        if isinstance(filter, BooleanFilter):
+            count_field_usage(filter.filters)
+            continue
+
+        column = getattr(filter.sqlalchemy_field, "expression", None)
+        table = getattr(column, "table", None)
+        if table is not None:
+            FILTER_FIELD_USAGE.labels(table.name, column.name).inc()
+
+
 def get_named_models(filters):
     models = set()
     for filter in filters:
@@ -218,20 +339,41 @@ def apply_filters(stmt: Select, filter_spec, do_auto_join=True):
         The :class:`sqlalchemy.sql.selectable.Select` instance after all the
         filters have been applied.
     """
-    filters = build_filters(filter_spec)
+    started_at = perf_counter() if FILTER_TRACE_HOOKS else None
+
+    values = []
+    key = (
+        tuple(get_query_models(stmt).values()),
+        get_spec_shape(filter_spec, values),
+    )
+
+    try:
+        filters = FILTER_PLANS.get(key)
+    except TypeError:  # unhashable spec, it will not be cached
+        key, filters = None, None
+
+    is_cached = filters is not None
+    if not is_cached:
+        filters = build_filters(filter_spec)
 
     default_model = get_default_model(stmt)
 
+    values = iter(values)
     sqlalchemy_filters = [
-        filter.format_for_sqlalchemy(stmt, default_model) for filter in filters
+        filter.format_for_sqlalchemy(stmt, default_model, values)
+        for filter in filters
     ]
 
-    pprint.pp("@@@@@@@@@@@@@@@@@@@@")
-    pprint.pp(default_model)
-    pprint.pp(sqlalchemy_filters)
-    pprint.pp("@@@@@@@@@@@@@@@@@@@@")
+    # Only filters which could be resolved against the query are cached.
+    if key is not None and not is_cached:
+        FILTER_PLANS.set(key, filters)
+
+    count_field_usage(filters)
 
     if sqlalchemy_filters:
         stmt = stmt.where(*sqlalchemy_filters)
 
+        if started_at is not None:
+            _trace_filters(sqlalchemy_filters, started_at)
+
     return stmt
@@ -1,4 +1,5 @@
 import types
+from functools import lru_cache
 
 from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.inspection import inspect
@@ -30,18 +31,28 @@ class Field(object):
         return sqlalchemy_field
 
     def _get_valid_field_names(self):
-        inspect_mapper = inspect(self.model)
-        columns = inspect_mapper.columns
-        orm_descriptors = inspect_mapper.all_orm_descriptors
-
-        column_names = columns.keys()
-        hybrid_names = [
-            key
-            for key, item in orm_descriptors.items()
-            if _is_hybrid_property(item) or _is_hybrid_method(item)
-        ]
-
-        return set(column_names) | set(hybrid_names)
+        return get_valid_field_names(self.model)
+
+
+@lru_cache(maxsize=None)
+def get_valid_field_names(model):
+    """Return the names of the columns and hybrid attributes of `model`.
+
+    The mapper of a model does not change once configured, so the names
+    are computed once per model.
+    """
+    inspect_mapper = inspect(model)
+    columns = inspect_mapper.columns
+    orm_descriptors = inspect_mapper.all_orm_descriptors
+
+    column_names = columns.keys()
+    hybrid_names = [
+        key
+        for key, item in orm_descriptors.items()
+        if _is_hybrid_property(item) or _is_hybrid_method(item)
+    ]
+
+    return frozenset(column_names) | frozenset(hybrid_names)
 
 
 def _is_hybrid_property(orm_descriptor):
@@ -1,11 +1,27 @@
 # -*- coding: utf-8 -*-
 
+from app.core.cache import LRUCache
+
 from .exceptions import BadSortFormat
-from .models import Field, auto_join, get_default_model, get_model_from_spec
+from .models import (
+    Field,
+    auto_join,
+    get_default_model,
+    get_model_from_spec,
+    get_query_models,
+)
 
 SORT_ASCENDING = "asc"
 SORT_DESCENDING = "desc"
 
+NULLS_FIRST = "first"
+NULLS_LAST = "last"
+
+SORT_PLANS = LRUCache(maxsize=256)
+"""
+Sorts already resolved against the models of a query, keyed by the sort spec.
+"""
+
 
 class Sort(object):
     def __init__(self, sort_spec):
@@ -30,21 +46,33 @@ class Sort(object):
         self.direction = direction
         self.nullsfirst = sort_spec.get("nullsfirst")
         self.nullslast = sort_spec.get("nullslast")
+        self.sqlalchemy_field = None
 
     def get_named_models(self):
         if "model" in self.sort_spec:
             return {self.sort_spec["model"]}
         return set()
 
-    def format_for_sqlalchemy(self, query, default_model):
-        sort_spec = self.sort_spec
-        direction = self.direction
-        field_name = self.field_name
+    def get_sqlalchemy_field(self, query, default_model):
+        # The field is resolved once, the sort may be reused afterwards.
+        if self.sqlalchemy_field is None:
+            model = get_model_from_spec(self.sort_spec, query, default_model)
+            field = Field(model, self.field_name)
+            self.sqlalchemy_field = field.get_sqlalchemy_field()
 
-        model = get_model_from_spec(sort_spec, query, default_model)
+        return self.sqlalchemy_field
 
-        field = Field(model, field_name)
-        sqlalchemy_field = field.get_sqlalchemy_field()
+    def get_nulls(self):
+        if self.nullsfirst:
+            return NULLS_FIRST
+        elif self.nullslast:
+            return NULLS_LAST
+        else:
+            return None
+
+    def format_for_sqlalchemy(self, query, default_model):
+        direction = self.direction
+        sqlalchemy_field = self.get_sqlalchemy_field(query, default_model)
 
         if direction == SORT_ASCENDING:
             sort_fnc = sqlalchemy_field.asc
@@ -66,6 +94,62 @@ def get_named_models(sorts):
     return models
 
 
+def get_sorts(query, sort_spec):
+    """Build the sorts of `sort_spec` resolved against the models of
+    `query`, reusing the ones already built for the same spec."""
+    if isinstance(sort_spec, dict):
+        sort_spec = [sort_spec]
+
+    sort_spec = sort_spec or []
+
+    try:
+        key = (
+            tuple(get_query_models(query).values()),
+            tuple(tuple(sorted(item.items())) for item in sort_spec),
+        )
+        sorts = SORT_PLANS.get(key)
+    except (AttributeError, TypeError):  # bad spec, it will not be cached
+        key, sorts = None, None
+
+    if sorts is not None:
+        return sorts
+
+    sorts = [Sort(item) for item in sort_spec]
+
+    default_model = get_default_model(query)
+    for sort in sorts:
+        sort.get_sqlalchemy_field(query, default_model)
+
+    if key is not None:
+        SORT_PLANS.set(key, sorts)
+
+    return sorts
+
+
+def get_sort_keys(query, sort_spec):
+    """Resolve a sort spec into the keys used by keyset pagination.
+
+    :param sort_spec:
+        A list of dictionaries in the same format accepted by
+        :func:`apply_sort`.
+
+    :returns:
+        A list of ``(field_name, sqlalchemy_field, direction, nulls)``
+        tuples, in the same order as the provided sort spec. ``nulls`` is
+        ``NULLS_FIRST`` or ``NULLS_LAST`` when the spec sets `nullsfirst`
+        or `nullslast`, otherwise ``None``.
+    """
+    return [
+        (
+            sort.field_name,
+            sort.sqlalchemy_field,
+            sort.direction,
+            sort.get_nulls(),
+        )
+        for sort in get_sorts(query, sort_spec)
+    ]
+
+
 def apply_sort(query, sort_spec):
     """Apply sorting to a :class:`sqlalchemy.orm.Query` instance.
 
@@ -99,10 +183,7 @@ def apply_sort(query, sort_spec):
         The :class:`sqlalchemy.orm.Query` instance after the provided
         sorting has been applied.
     """
-    if isinstance(sort_spec, dict):
-        sort_spec = [sort_spec]
-
-    sorts = [Sort(item) for item in sort_spec]
+    sorts = get_sorts(query, sort_spec)
 
     default_model = get_default_model(query)
 
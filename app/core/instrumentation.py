@@ -0,0 +1,132 @@
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+_query_stats = ContextVar("query_stats", default=None)
+
+
+class QueryStats(object):
+    """Statistics of the SQL statements issued while handling a request."""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.duration = 0.0
+        self.slowest_statement = None
+        self.slowest_duration = 0.0
+
+    def add_statement(self, statement: str, duration: float):
+        self.statements += 1
+        self.duration += duration
+
+        if self.slowest_statement is None or duration > self.slowest_duration:
+            self.slowest_statement = statement
+            self.slowest_duration = duration
+
+    def add_commit(self):
+        self.commits += 1
+
+    def server_timing(self):
+        """Return the value of the ``Server-Timing`` header."""
+        return 'db;dur={:.2f};desc="{} statements, {} commits"'.format(
+            self.duration * 1000, self.statements, self.commits
+        )
+
+    def dict(self):
+        """Return a dictionary representation of the statistics."""
+        return {
+            "statements": self.statements,
+            "commits": self.commits,
+            "db_time_ms": round(self.duration * 1000, 2),
+            "slowest_statement": self.slowest_statement,
+            "slowest_time_ms": round(self.slowest_duration * 1000, 2),
+        }
+
+
+def get_query_stats():
+    """Return the query statistics of the current request, if any."""
+    return _query_stats.get()
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if _query_stats.get() is not None:
+        conn.info.setdefault("query_stats_started_at", []).append(
+            perf_counter()
+        )
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    stats = _query_stats.get()
+    started_at = conn.info.get("query_stats_started_at")
+
+    if stats is not None and started_at:
+        stats.add_statement(statement, perf_counter() - started_at.pop())
+
+
+def _commit(conn):
+    stats = _query_stats.get()
+
+    if stats is not None:
+        stats.add_commit()
+
+
+def setup_query_stats(engine):
+    """Listen to the statements and commits of ``engine`` to collect the
+    query statistics of the requests handled by
+    :class:`QueryStatsMiddleware`."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    for identifier, fn in [
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("commit", _commit),
+    ]:
+        if not event.contains(sync_engine, identifier, fn):
+            event.listen(sync_engine, identifier, fn)
+
+
+class QueryStatsMiddleware(object):
+    """Collect the query statistics of each request, sending them in the
+    ``Server-Timing`` header of the response and in a log line."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _query_stats.set(stats)
+
+        async def send_with_server_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            _query_stats.reset(token)
+
+            logger.info(
+                "Request query stats with={}".format(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        **stats.dict(),
+                    }
+                )
+            )
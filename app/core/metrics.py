@@ -0,0 +1,213 @@
+import os
+from time import perf_counter
+
+from celery import signals
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from starlette.routing import Match
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latency of the HTTP requests by route.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled by route.",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time waited to check out a connection from the database pool.",
+    ["engine"],
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections opened by the database pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections checked out from the database pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+TASK_ENQUEUE_LATENCY = Histogram(
+    "celery_task_enqueue_seconds",
+    "Time spent to publish a Celery task to the broker.",
+    ["task"],
+)
+FILTER_FIELD_USAGE = Counter(
+    "filter_field_usage",
+    "Fields used by the generic filters of the list endpoints.",
+    ["table", "field"],
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "Password hashes and verifications waiting for a worker of the pool.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_seconds",
+    "Time spent to hash or verify a password in the pool.",
+    ["operation"],
+)
+TOKEN_REVOCATION_LOOKUPS = Counter(
+    "token_revocation_lookups",
+    "Lookups of the access tokens in the revocation filter, by result.",
+    ["result"],
+)
+TOKEN_CLAIMS_CACHE_LOOKUPS = Counter(
+    "token_claims_cache_lookups",
+    "Lookups of the decoded access token claims in the cache, by result.",
+    ["result"],
+)
+
+INSTRUMENTED_TASKS = {
+    "app.notification.tasks.send_mail_verification",
+    "app.notification.tasks.send_mail_reset_password",
+}
+
+_task_published_at = {}
+
+
+def get_metrics():
+    """Return the metrics in the Prometheus text format, along with their
+    content type.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set, the metrics are written to
+    files in that directory by each worker process and aggregated here.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _get_route(scope):
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+
+    # Unmatched paths are grouped to keep the number of labels bounded.
+    return "unmatched"
+
+
+class MetricsMiddleware(object):
+    """Measure the latency and the in progress requests of each route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, route = scope["method"], _get_route(scope)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started_at = perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUEST_LATENCY.labels(method, route, status_code).observe(
+                perf_counter() - started_at
+            )
+            in_progress.dec()
+
+
+def setup_db_metrics(engine, name: str = "primary"):
+    """Measure the checkouts and connections of the pool of ``engine``,
+    labelled with ``name``."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    # The pool fires no event before a checkout, so the wait is measured
+    # around the connect method of the engine, which the sessions and the
+    # async connections check out their connection with.
+    engine_connect = sync_engine.connect
+    checkout_seconds = DB_POOL_CHECKOUT.labels(name)
+
+    def timed_connect(*args, **kwargs):
+        started_at = perf_counter()
+        try:
+            return engine_connect(*args, **kwargs)
+        finally:
+            checkout_seconds.observe(perf_counter() - started_at)
+
+    sync_engine.connect = timed_connect
+
+    connections = DB_POOL_CONNECTIONS.labels(name)
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+
+    @event.listens_for(sync_engine, "connect")
+    def connect(dbapi_connection, connection_record):
+        connections.inc()
+
+    @event.listens_for(sync_engine, "close")
+    def close(dbapi_connection, connection_record):
+        connections.dec()
+
+    @event.listens_for(sync_engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+
+    @event.listens_for(sync_engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+
+
+def child_exit(server, worker):
+    """Gunicorn hook which removes the live gauges of an exited worker
+    from the aggregated metrics.
+
+    Set it with ``gunicorn -c python:app.core.metrics``, or call it from
+    the ``child_exit`` hook of the gunicorn configuration.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def _before_task_publish(sender=None, headers=None, **kwargs):
+    if sender in INSTRUMENTED_TASKS:
+        _task_published_at[headers["id"]] = perf_counter()
+
+
+def _after_task_publish(sender=None, headers=None, **kwargs):
+    started_at = _task_published_at.pop((headers or {}).get("id"), None)
+
+    if started_at is not None:
+        TASK_ENQUEUE_LATENCY.labels(sender).observe(
+            perf_counter() - started_at
+        )
+
+
+def setup_task_metrics():
+    """Measure the time spent to enqueue the instrumented tasks."""
+    signals.before_task_publish.connect(_before_task_publish, weak=False)
+    signals.after_task_publish.connect(_after_task_publish, weak=False)
@@ -0,0 +1,39 @@
+from http.cookies import SimpleCookie
+
+from starlette.datastructures import MutableHeaders
+
+from app.depends import READ_YOUR_WRITES_COOKIE
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware(object):
+    """Set the read your writes cookie on successful mutations, so that
+    the next reads of the client are not served by a lagging replica."""
+
+    def __init__(self, app, max_age: int):
+        self.app = app
+        self.max_age = max_age
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and (
+                message["status"] < 400
+            ):
+                cookie = SimpleCookie()
+                cookie[READ_YOUR_WRITES_COOKIE] = "1"
+                cookie[READ_YOUR_WRITES_COOKIE]["max-age"] = self.max_age
+                cookie[READ_YOUR_WRITES_COOKIE]["path"] = "/"
+                cookie[READ_YOUR_WRITES_COOKIE]["httponly"] = True
+                cookie[READ_YOUR_WRITES_COOKIE]["samesite"] = "lax"
+
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", cookie.output(header="").strip())
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -1,14 +1,59 @@
+import base64
+import binascii
+import json
 import math
 from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
 
-from sqlalchemy import func
+from sqlalchemy import and_, false, func, or_, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
 
 from app.core.filters.exceptions import InvalidPage
+from app.core.filters.sorting import NULLS_LAST, SORT_ASCENDING
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATE = "estimate"
+COUNT_NONE = "none"
+COUNT_WINDOW = "window"
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE, COUNT_WINDOW)
+
+Pagination = namedtuple(
+    "Pagination",
+    ["page_number", "page_size", "num_pages", "total_results", "count"],
+)
+Keyset = namedtuple(
+    "Keyset", ["sort_keys", "page_size", "is_backwards", "has_cursor"]
+)
+
+
+def selects_entity(stmt):
+    """Return whether `stmt` selects a single ORM entity, whose rows are
+    unpacked into instances, instead of a projection of columns."""
+    descriptions = stmt.column_descriptions
+    return (
+        len(descriptions) == 1
+        and descriptions[0]["expr"] is descriptions[0]["entity"]
+    )
+
+
+def get_items(result, stmt):
+    """Return the items of a result, instances or rows, see
+    :func:`selects_entity`."""
+    if selects_entity(stmt):
+        return result.scalars().all()
+
+    return result.all()
 
 
 async def apply_pagination(
-    stmt, session: AsyncSession, page_number=None, page_size=None
+    stmt,
+    session: AsyncSession,
+    page_number=None,
+    page_size=None,
+    count=COUNT_EXACT,
 ):
     """Apply pagination to a SQLAlchemy stmt object.
 
@@ -25,14 +70,23 @@ async def apply_pagination(
         Maximum number of results to be returned in the page (defaults
         to the total results).
 
+    :param count:
+        How the total results are obtained, see :func:`get_total_results`.
+        With ``window`` the total is selected along with the rows as a
+        ``count(*) OVER ()`` column and resolved by
+        :func:`get_window_page`. With ``estimate`` and ``none``, one
+        extra row is fetched so that :func:`get_page_items` can tell
+        whether there is a next page.
+
     :returns:
         A 2-tuple with the paginated SQLAlchemy stmt object and
         a pagination namedtuple.
 
         The pagination object contains information about the results
         and pages: ``page_size`` (defaults to ``total_results``),
-        ``page_number`` (defaults to 1), ``num_pages`` and
-        ``total_results``.
+        ``page_number`` (defaults to 1), ``num_pages``,
+        ``total_results`` and the ``count`` mode. ``num_pages`` and
+        ``total_results`` are ``None`` when the count mode is ``none``.
 
     Basic usage::
 
@@ -47,38 +101,425 @@ async def apply_pagination(
         3
         >>> pagination.total_results
         22
-        >>> page_size, page_number, num_pages, total_results = pagination
+        >>> pagination.count
+        'exact'
     """
 
-    query_count = await session.execute(stmt.with_only_columns(func.count()))
+    if count == COUNT_WINDOW:
+        stmt = _limit(stmt, page_size).add_columns(
+            func.count().over().label("total_results")
+        )
+        if page_size is not None:
+            stmt = _offset(stmt, page_number, page_size)
 
-    total_results = query_count.scalar_one()
+        return stmt, Pagination(page_number or 1, page_size, None, None, count)
+
+    total_results = await get_total_results(stmt, session, count=count)
     stmt = _limit(stmt, page_size)
 
-    # Page size defaults to total results
-    if page_size is None or (page_size > total_results and total_results > 0):
-        page_size = total_results
+    if count == COUNT_EXACT:
+        # Page size defaults to total results
+        if page_size is None or (
+            page_size > total_results and total_results > 0
+        ):
+            page_size = total_results
 
-    stmt = _offset(stmt, page_number, page_size)
+        stmt = _offset(stmt, page_number, page_size)
+    elif page_size is not None:
+        # Fetch one extra row to know whether there is a next page.
+        stmt = _offset(stmt, page_number, page_size).limit(page_size + 1)
 
     # Page number defaults to 1
     if page_number is None:
         page_number = 1
 
-    num_pages = _calculate_num_pages(page_size, total_results)
+    num_pages = None
+    if total_results is not None:
+        num_pages = _calculate_num_pages(
+            total_results if page_size is None else page_size, total_results
+        )
+
+    return stmt, Pagination(
+        page_number, page_size, num_pages, total_results, count
+    )
+
+
+def get_page_items(items, pagination):
+    """Trim the lookahead row fetched by :func:`apply_pagination`.
+
+    :returns:
+        A 2-tuple with the items of the page and whether there is a
+        next page.
+    """
+    items = list(items)
+
+    if pagination.count in (COUNT_EXACT, COUNT_WINDOW):
+        return items, pagination.page_number < pagination.num_pages
+
+    if pagination.page_size is None:
+        return items, False
+
+    return (
+        items[: pagination.page_size],
+        len(items) > pagination.page_size,
+    )
+
+
+async def get_window_page(rows, pagination, stmt, session: AsyncSession):
+    """Resolve a page fetched by :func:`apply_pagination` in window mode.
+
+    :param rows:
+        The rows of the page, each one ending with the total results,
+        which are unpacked into instances when `stmt` selects an entity.
+
+    :param stmt:
+        The stmt before pagination, only used to count the results when
+        the page is past the last one and therefore has no rows.
+
+    :returns:
+        A 2-tuple with the items of the page and the pagination
+        namedtuple filled with ``num_pages`` and ``total_results``.
+    """
+    items = rows
+    if selects_entity(stmt):
+        items = [row[0] for row in rows]
+
+    if rows:
+        total_results = rows[0][-1]
+    elif pagination.page_number > 1:
+        total_results = await count_results(stmt, session)
+    else:
+        total_results = 0
+
+    page_size = pagination.page_size
+
+    # Page size defaults to total results
+    if page_size is None or (page_size > total_results and total_results > 0):
+        page_size = total_results
+
+    return items, pagination._replace(
+        page_size=page_size,
+        num_pages=_calculate_num_pages(page_size, total_results),
+        total_results=total_results,
+    )
+
+
+async def get_total_results(stmt, session: AsyncSession, count=COUNT_EXACT):
+    """Return the total number of rows matched by a SQLAlchemy stmt.
+
+    :param count:
+        ``exact`` runs a ``COUNT(*)`` query, ``estimate`` uses the
+        planner's row estimate on PostgreSQL (falling back to ``exact``
+        on other backends) and ``none`` skips counting, returning
+        ``None``. ``window`` is counted as ``exact`` here, as it only
+        saves the query when used through :func:`apply_pagination`.
+    """
+    if count not in COUNT_MODES:
+        raise InvalidPage(
+            "Count mode `{}` not valid.".format(count), param="count"
+        )
+
+    if count == COUNT_NONE:
+        return None
+
+    if count == COUNT_ESTIMATE and session.bind.dialect.name == "postgresql":
+        return await estimate_results(stmt, session)
+
+    return await count_results(stmt, session)
+
+
+async def estimate_results(stmt, session: AsyncSession):
+    """Return the PostgreSQL planner's estimate of rows matched by a stmt."""
+    compiled = stmt.order_by(None).compile(
+        dialect=postgresql.dialect(paramstyle="named"),
+        compile_kwargs={"render_postcompile": True},
+    )
+
+    query = await session.execute(
+        text("EXPLAIN (FORMAT JSON) {}".format(compiled.string)).bindparams(
+            **compiled.params
+        )
+    )
+
+    plan = query.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
 
-    Pagination = namedtuple(
-        "Pagination",
-        ["page_number", "page_size", "num_pages", "total_results"],
+
+async def count_results(stmt, session: AsyncSession):
+    """Return the total number of rows matched by a SQLAlchemy stmt."""
+    query_count = await session.execute(
+        select(func.count()).select_from(stmt.order_by(None).subquery())
     )
-    return stmt, Pagination(page_number, page_size, num_pages, total_results)
+
+    return query_count.scalar_one()
+
+
+def apply_keyset_pagination(stmt, sort_keys, cursor=None, page_size=None):
+    """Apply keyset (seek) pagination to a SQLAlchemy stmt object.
+
+    Instead of skipping ``(page - 1) * size`` rows, the page starts right
+    after the row encoded in ``cursor``, so the cost of fetching a page
+    does not depend on how deep it is.
+
+    :param stmt:
+        A :class:`sqlalchemy.sql.selectable.Select` instance.
+
+    :param sort_keys:
+        A list of ``(field_name, sqlalchemy_field, direction, nulls)``
+        tuples, as returned by
+        :func:`app.core.filters.sorting.get_sort_keys`. The last key must
+        be unique (e.g. the primary key) so that the order is total.
+
+    :param cursor:
+        An opaque token returned as ``next_cursor`` or ``prev_cursor`` by
+        a previous page, or ``None`` for the first page.
+
+    :param page_size:
+        Maximum number of results to be returned in the page (defaults
+        to the total results).
+
+    :returns:
+        A 2-tuple with the paginated SQLAlchemy stmt object and a keyset
+        namedtuple to be given to :func:`get_keyset_page` along with the
+        fetched items.
+    """
+    is_backwards = False
+
+    if cursor is not None:
+        values, is_backwards = decode_cursor(cursor, sort_keys)
+        stmt = stmt.where(_seek_predicate(sort_keys, values, is_backwards))
+
+    stmt = stmt.order_by(None).order_by(*get_order_by(sort_keys, is_backwards))
+
+    if page_size is not None:
+        if page_size < 0:
+            raise InvalidPage(
+                "Page size should not be negative: {}".format(page_size),
+                param="itemsPerPage",
+            )
+
+        # Fetch one extra row to know whether there is another page.
+        stmt = stmt.limit(page_size + 1)
+
+    return stmt, Keyset(sort_keys, page_size, is_backwards, cursor is not None)
+
+
+def get_order_by(sort_keys, is_backwards=False):
+    """Get the ``ORDER BY`` clauses of ``sort_keys``, reversed when
+    ``is_backwards``.
+
+    The NULLs are sorted where their sort key places them, after every
+    value by default, whatever the dialect, as the keyset pagination
+    expects them to be.
+    """
+    return [
+        _sort_column(column, direction, nulls, is_backwards)
+        for _, column, direction, nulls in sort_keys
+    ]
+
+
+def get_keyset_page(items, keyset):
+    """Trim the lookahead row of a keyset page and build its cursors.
+
+    :returns:
+        A 3-tuple with the items of the page, the ``next_cursor`` and the
+        ``prev_cursor`` (``None`` when there is no such page).
+    """
+    items = list(items)
+
+    has_more = keyset.page_size is not None and len(items) > keyset.page_size
+    if has_more:
+        items = items[: keyset.page_size]
+
+    if keyset.is_backwards:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, keyset.has_cursor
+
+    next_cursor = prev_cursor = None
+
+    if items and has_next:
+        next_cursor = encode_cursor(items[-1], keyset.sort_keys)
+
+    if items and has_prev:
+        prev_cursor = encode_cursor(
+            items[0], keyset.sort_keys, is_backwards=True
+        )
+
+    return items, next_cursor, prev_cursor
+
+
+def encode_cursor(item, sort_keys, is_backwards=False):
+    """Encode the sort key values of ``item`` into an opaque cursor."""
+    values = [getattr(item, field_name) for field_name, _, _, _ in sort_keys]
+    payload = json.dumps(
+        {"v": values, "b": is_backwards, "s": _get_sort_signature(sort_keys)},
+        default=_json_default,
+        separators=(",", ":"),
+    )
+
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor, sort_keys):
+    """Decode a cursor into its sort key values and direction.
+
+    :raise InvalidPage:
+        If the cursor is malformed or does not match ``sort_keys``.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values, is_backwards = payload["v"], bool(payload["b"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidPage("Cursor `{}` not valid.".format(cursor))
+
+    # The cursors encoded before they carried their sort are only checked
+    # against the number of keys.
+    signature = payload.get("s", _get_sort_signature(sort_keys))
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(sort_keys)
+        or signature != _get_sort_signature(sort_keys)
+    ):
+        raise InvalidPage(
+            "Cursor `{}` does not match the sort.".format(cursor)
+        )
+
+    values = [
+        _coerce_value(column, value)
+        for (_, column, _, _), value in zip(sort_keys, values)
+    ]
+
+    return values, is_backwards
+
+
+def _get_sort_signature(sort_keys):
+    return [
+        ":".join(filter(None, [field_name, direction, nulls]))
+        for field_name, _, direction, nulls in sort_keys
+    ]
+
+
+def _seek_predicate(sort_keys, values, is_backwards):
+    # Expanded form of `(a, b, id) > (:a, :b, :id)` which supports mixed
+    # directions and works on backends without row value comparisons.
+    clauses = []
+    for index, (_, column, direction, nulls) in enumerate(sort_keys):
+        is_ascending = (direction == SORT_ASCENDING) != is_backwards
+        is_nulls_last = _is_nulls_last(direction, nulls, is_backwards)
+
+        clauses.append(
+            and_(
+                *[
+                    _equal(previous_column, previous_value)
+                    for (_, previous_column, _, _), previous_value in zip(
+                        sort_keys[:index], values[:index]
+                    )
+                ],
+                _after(column, values[index], is_ascending, is_nulls_last),
+            )
+        )
+
+    return or_(*clauses)
+
+
+def _is_nullable(column):
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def _equal(column, value):
+    if value is None:
+        return column.is_(None)
+
+    return column == value
+
+
+def _is_nulls_last(direction, nulls, is_backwards):
+    # Unless the sort key places them, the NULLs are sorted after every
+    # value: last when ascending and first when descending.
+    if nulls is None:
+        is_nulls_last = direction == SORT_ASCENDING
+    else:
+        is_nulls_last = nulls == NULLS_LAST
+
+    return is_nulls_last != is_backwards
+
+
+def _after(column, value, is_ascending, is_nulls_last):
+    # Nothing is after the NULLs when they are last, and every value is
+    # after them when they are first.
+    if value is None:
+        return false() if is_nulls_last else column.isnot(None)
+
+    after = column > value if is_ascending else column < value
+
+    if is_nulls_last and _is_nullable(column):
+        return or_(after, column.is_(None))
+
+    return after
+
+
+def _sort_column(column, direction, nulls, is_backwards):
+    if (direction == SORT_ASCENDING) != is_backwards:
+        clause = column.asc()
+    else:
+        clause = column.desc()
+
+    if not _is_nullable(column):
+        return clause
+
+    if _is_nulls_last(direction, nulls, is_backwards):
+        return clause.nulls_last()
+
+    return clause.nulls_first()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+
+    if isinstance(value, Decimal):
+        return str(value)
+
+    raise TypeError(
+        "Object of type {} is not cursor serializable".format(
+            value.__class__.__name__
+        )
+    )
+
+
+def _coerce_value(column, value):
+    if value is None:
+        return value
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        if python_type in (datetime, date) and isinstance(value, str):
+            return python_type.fromisoformat(value)
+
+        if python_type is Decimal:
+            return Decimal(value)
+    except (ArithmeticError, ValueError):
+        raise InvalidPage("Cursor value `{}` not valid.".format(value))
+
+    return value
 
 
 def _limit(query, page_size):
     if page_size is not None:
         if page_size < 0:
             raise InvalidPage(
-                "Page size should not be negative: {}".format(page_size)
+                "Page size should not be negative: {}".format(page_size),
+                param="itemsPerPage",
             )
 
         query = query.limit(page_size)
@@ -90,7 +531,8 @@ def _offset(query, page_number, page_size):
     if page_number is not None:
         if page_number < 1:
             raise InvalidPage(
-                "Page number should be positive: {}".format(page_number)
+                "Page number should be positive: {}".format(page_number),
+                param="page",
             )
 
         query = query.offset((page_number - 1) * page_size)
@@ -0,0 +1,224 @@
+import csv
+import io
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from inspect import isclass
+
+import orjson
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+from sqlalchemy import inspect
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import NoInspectionAvailable
+from starlette.responses import Response, StreamingResponse
+
+EXACT_TYPES = (bool, int, float, str, datetime, date, dict)
+"""Types whose values are serialized as they are when they match exactly,
+any other value is validated by the pydantic field."""
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+_missing = object()
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+
+    raise TypeError
+
+
+@lru_cache(maxsize=None)
+def _get_mapped_attributes(cls):
+    try:
+        return frozenset(inspect(cls).attrs.keys())
+    except NoInspectionAvailable:
+        return frozenset()
+
+
+def _get_value(obj, name):
+    if isinstance(obj, dict):
+        return obj.get(name, _missing)
+
+    if isinstance(obj, Row):
+        return obj._mapping.get(name, _missing)
+
+    # The loaded attributes of an instance are in its dictionary, the ones
+    # which are not are left out instead of being lazy loaded.
+    values = getattr(obj, "__dict__", {})
+    if name in values:
+        return values[name]
+
+    if name in _get_mapped_attributes(type(obj)):
+        return _missing
+
+    return getattr(obj, name, _missing)
+
+
+def _compile_converter(field, schema):
+    if field.shape == SHAPE_LIST:
+        convert_item = _compile_converter(field.sub_fields[0], schema)
+
+        def convert(value):
+            return [convert_item(item) for item in value]
+
+        return convert
+
+    if field.shape == SHAPE_SINGLETON:
+        type_ = field.type_
+
+        if isclass(type_) and issubclass(type_, BaseModel):
+            return get_serializer(type_)
+
+        if type_ in EXACT_TYPES:
+
+            def convert(value):
+                if type(value) is type_:
+                    return value
+
+                return _validate(field, value, schema)
+
+            return convert
+
+    return lambda value: _validate(field, value, schema)
+
+
+def _validate(field, value, schema):
+    value, errors = field.validate(value, {}, loc=field.alias)
+
+    # Raised as FastAPI does for the invalid values of a response model.
+    if errors:
+        raise ValidationError([errors], schema)
+
+    if isinstance(value, BaseModel):
+        return get_serializer(type(value))(value)
+
+    return value
+
+
+@lru_cache(maxsize=None)
+def get_serializer(schema):
+    """Compile the function which maps an ORM instance, a row or a
+    dictionary to the dictionary of the fields of ``schema``, as the
+    pydantic model would read and serialize them."""
+    fields = [
+        (field.alias, _compile_converter(field, schema), field)
+        for field in schema.__fields__.values()
+    ]
+
+    def serialize(obj):
+        data = {}
+
+        for name, convert, field in fields:
+            value = _get_value(obj, name)
+
+            if value is _missing:
+                value = field.get_default()
+
+            data[name] = None if value is None else convert(value)
+
+        return data
+
+    return serialize
+
+
+class SchemaJSONResponse(Response):
+    """JSON response rendered by orjson.
+
+    The content is mapped through the fields of ``schema``, when given,
+    instead of being validated by its pydantic model and encoded with
+    ``jsonable_encoder``.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content, schema=None, **kwargs):
+        self.schema = schema
+        super().__init__(content, **kwargs)
+
+    def render(self, content):
+        if self.schema is not None:
+            content = get_serializer(self.schema)(content)
+
+        return orjson.dumps(content, default=_default)
+
+
+def _get_csv_value(value):
+    if value is None:
+        return ""
+
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value, default=_default).decode()
+
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+
+    return value
+
+
+async def _iter_ndjson(chunks, serialize):
+    async for items in chunks:
+        yield b"".join(
+            orjson.dumps(
+                serialize(item),
+                default=_default,
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+            for item in items
+        )
+
+
+async def _iter_csv(chunks, serialize, fieldnames):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for items in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+
+        for item in items:
+            writer.writerow(
+                {
+                    name: _get_csv_value(value)
+                    for name, value in serialize(item).items()
+                }
+            )
+
+        yield buffer.getvalue()
+
+
+class ExportStreamingResponse(StreamingResponse):
+    """Stream the chunks of items of an export as newline delimited JSON
+    or CSV, one chunk at a time.
+
+    The items are mapped through the fields of ``schema``, as in
+    :class:`SchemaJSONResponse`, unless ``fields`` are given, in which
+    case they are already dictionaries of them.
+    """
+
+    def __init__(
+        self, chunks, export_format, schema, fields=None, filename="export"
+    ):
+        serialize = get_serializer(schema) if not fields else dict
+
+        if export_format == "csv":
+            fieldnames = fields or [
+                field.alias for field in schema.__fields__.values()
+            ]
+            content = _iter_csv(chunks, serialize, fieldnames)
+        else:
+            content = _iter_ndjson(chunks, serialize)
+
+        super().__init__(
+            content,
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={
+                "Content-Disposition": 'attachment; filename="{}.{}"'.format(
+                    filename, export_format
+                )
+            },
+        )
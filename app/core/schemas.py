@@ -1,6 +1,9 @@
-from typing import List
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel
+from pydantic.utils import GetterDict
+from sqlalchemy import inspect
+from sqlalchemy.exc import NoInspectionAvailable
 
 
 class RootSchema(BaseModel):
@@ -8,9 +11,24 @@ class RootSchema(BaseModel):
     version: str
 
 
+class OrmGetterDict(GetterDict):
+    """Read the attributes of a model, leaving out the ones not loaded, so
+    that serializing never lazy loads a relationship."""
+
+    def get(self, key, default=None):
+        try:
+            if key in inspect(self._obj).unloaded:
+                return default
+        except NoInspectionAvailable:
+            pass
+
+        return super().get(key, default)
+
+
 class SchemaBase(BaseModel):
     class Config:
         orm_mode = True
+        getter_dict = OrmGetterDict
         validate_assignment = True
         arbitrary_types_allowed = True
 
@@ -18,9 +36,13 @@ class SchemaBase(BaseModel):
 class PaginationSchema(SchemaBase):
     items: List = []
     per_page: int
-    num_pages: int
-    total: int
-    page: int
+    num_pages: Optional[int] = None
+    total: Optional[int] = None
+    page: Optional[int] = None
+    count: Literal["exact", "estimate", "none", "window"] = "exact"
+    has_next: Optional[bool] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 
 class PhoneSchema(SchemaBase):
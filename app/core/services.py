@@ -1,15 +1,105 @@
+import math
 from typing import List
 
 from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.selectable import Select
 
 from app.config import get_settings
+from app.core.filters.exceptions import InvalidPage
 from app.core.filters.filters import apply_filters
-from app.core.filters.sorting import apply_sort
-from app.core.pagination import apply_pagination
+from app.core.filters.models import Field
+from app.core.filters.sorting import SORT_ASCENDING, apply_sort, get_sort_keys
+from app.core.pagination import (
+    COUNT_EXACT,
+    COUNT_WINDOW,
+    apply_keyset_pagination,
+    apply_pagination,
+    encode_cursor,
+    get_items,
+    get_keyset_page,
+    get_order_by,
+    get_page_items,
+    get_total_results,
+    get_window_page,
+    selects_entity,
+)
 
 settings = get_settings()
 
 
+def get_loader_options(model, include: List[str] = None):
+    """Get the loader options which eagerly load the relationships of
+    ``model`` named in ``include``, in a separate ``SELECT ... IN``."""
+    return [selectinload(getattr(model, name)) for name in include or []]
+
+
+def get_projection(model, fields: List[str], sort_keys):
+    """Get the columns of ``model`` named in ``fields``, followed by the
+    ones of the sort keys, from which the cursors are encoded."""
+    columns = [Field(model, field).get_sqlalchemy_field() for field in fields]
+    columns += [
+        sqlalchemy_field
+        for field_name, sqlalchemy_field, _, _ in sort_keys
+        if field_name not in fields
+    ]
+
+    return columns
+
+
+def get_field_items(rows, fields: List[str]):
+    """Get the rows of a projection as dictionaries of ``fields``."""
+    return [{field: getattr(row, field) for field in fields} for row in rows]
+
+
+def search_filter_sort(
+    model,
+    stmt: Select = None,
+    filter_spec: List[dict] = None,
+    sort_spec: List[str] = None,
+    fields: List[str] = None,
+):
+    """Apply the filters, sorts and projection of ``fields`` to ``stmt``,
+    ``select(model)`` by default.
+
+    Return the statement along with its sort keys, which always end with
+    the primary key, or ``None`` when ``stmt`` is already ordered: its
+    ``ORDER BY`` is kept first and the sort keys only break its ties, so
+    the rows cannot be sought by them.
+    """
+    if stmt is None:
+        stmt = select(model)
+
+    base_order_by = stmt._order_by_clauses
+
+    if filter_spec:
+        stmt = apply_filters(stmt, filter_spec)
+
+    if sort_spec:
+        stmt = apply_sort(stmt, sort_spec)
+
+    # The primary key is the tie-breaker which makes the order total,
+    # so that the last row of a page can be used as a cursor.
+    sort_keys = get_sort_keys(stmt, sort_spec)
+    if "id" not in [field_name for field_name, _, _, _ in sort_keys]:
+        sort_keys.append(("id", model.id, SORT_ASCENDING, None))
+
+    # Ordered as the keyset pagination seeks, whatever the page.
+    stmt = stmt.order_by(None).order_by(
+        *base_order_by, *get_order_by(sort_keys)
+    )
+
+    if fields:
+        stmt = stmt.with_only_columns(
+            *get_projection(model, fields, sort_keys)
+        )
+
+    if base_order_by:
+        sort_keys = None
+
+    return stmt, sort_keys
+
+
 async def search_filter_sort_paginate(
     session,
     model,
@@ -17,36 +107,166 @@ async def search_filter_sort_paginate(
     page: int = 1,
     items_per_page: int = settings.DEFAULT_ITEMS_PER_PAGE,
     sort_spec: List[str] = None,
+    cursor: str = None,
+    count: str = COUNT_EXACT,
+    include: List[str] = None,
+    stmt: Select = None,
+    fields: List[str] = None,
 ):
     """Common functionality for
-    searching, filtering, sorting, and pagination."""
-    stmt = select(model)
+    searching, filtering, sorting, and pagination.
 
-    if filter_spec:
-        stmt = apply_filters(stmt, filter_spec)
+    When ``cursor`` is given the page is fetched with keyset pagination
+    instead of ``page`` and ``OFFSET``. The ``count`` mode tells how the
+    total is obtained, see :func:`app.core.pagination.apply_pagination`.
+    The relationships named in ``include`` are loaded along with the items.
 
-    if sort_spec:
-        stmt = apply_sort(stmt, sort_spec)
+    ``stmt`` is the statement the filters, sorts and pagination are
+    applied to, ``select(model)`` by default. It may carry the scoping,
+    joins, loader options and column projections of the caller, the
+    filters and sorts are resolved against its selected models.
+
+    With ``fields`` only the columns named in it are selected, and the
+    items are returned as dictionaries of them instead of instances.
+    """
+    if not fields:
+        stmt = (stmt if stmt is not None else select(model)).options(
+            *get_loader_options(model, include)
+        )
+
+    stmt, sort_keys = search_filter_sort(
+        model, stmt, filter_spec, sort_spec, fields
+    )
 
     if items_per_page == -1:
         items_per_page = None
     elif items_per_page > settings.MAX_ITEMS_PER_PAGE:
         items_per_page = settings.MAX_ITEMS_PER_PAGE
 
-    stmt, pagination = await apply_pagination(
+    if cursor is not None:
+        if sort_keys is None:
+            raise InvalidPage("Cursor not supported by the statement order.")
+
+        pagination = await _keyset_paginate(
+            session, stmt, sort_keys, cursor, items_per_page, count
+        )
+    else:
+        pagination = await _offset_paginate(
+            session, stmt, sort_keys, page, items_per_page, count
+        )
+
+    if fields:
+        pagination["items"] = get_field_items(pagination["items"], fields)
+
+    return pagination
+
+
+async def _offset_paginate(
+    session, stmt, sort_keys, page, items_per_page, count
+):
+    paginated_stmt, pagination = await apply_pagination(
         stmt,
         session=session,
         page_number=page,
         page_size=items_per_page,
+        count=count,
     )
 
-    query = await session.execute(stmt)
-    await session.commit()
+    query = await session.execute(paginated_stmt)
+
+    if pagination.count == COUNT_WINDOW:
+        items, pagination = await get_window_page(
+            query.all(), pagination, stmt=stmt, session=session
+        )
+    else:
+        items = get_items(query, stmt)
+
+    items, has_next = get_page_items(items, pagination)
+
+    next_cursor = None
+    if items and has_next and sort_keys is not None:
+        next_cursor = encode_cursor(items[-1], sort_keys)
 
     return {
-        "items": query.scalars().all(),
+        "items": items,
         "per_page": pagination.page_size,
         "num_pages": pagination.num_pages,
         "page": pagination.page_number,
         "total": pagination.total_results,
+        "count": pagination.count,
+        "has_next": has_next,
+        "next_cursor": next_cursor,
+        "prev_cursor": None,
     }
+
+
+async def _keyset_paginate(
+    session, stmt, sort_keys, cursor, items_per_page, count
+):
+    total = await get_total_results(stmt, session=session, count=count)
+
+    stmt, keyset = apply_keyset_pagination(
+        stmt, sort_keys, cursor=cursor, page_size=items_per_page
+    )
+
+    query = await session.execute(stmt)
+
+    items, next_cursor, prev_cursor = get_keyset_page(
+        get_items(query, stmt), keyset
+    )
+
+    per_page = items_per_page
+    if per_page is None:
+        per_page = len(items) if total is None else total
+
+    num_pages = None
+    if total is not None:
+        num_pages = math.ceil(total / per_page) if per_page else 0
+
+    return {
+        "items": items,
+        "per_page": per_page,
+        "num_pages": num_pages,
+        "page": None,
+        "total": total,
+        "count": count,
+        "has_next": next_cursor is not None,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
+
+
+async def search_filter_sort_stream(
+    session,
+    model,
+    filter_spec: List[dict] = None,
+    sort_spec: List[str] = None,
+    stmt: Select = None,
+    fields: List[str] = None,
+    chunk_size: int = settings.EXPORT_CHUNK_SIZE,
+):
+    """Get every item matching the filters and sorts, as an asynchronous
+    iterator of chunks of ``chunk_size`` items.
+
+    The rows are fetched through a server-side cursor, ``chunk_size``
+    at a time, so the memory used stays the same whatever the number of
+    rows. With ``fields`` the items are dictionaries of them, as in
+    :func:`search_filter_sort_paginate`.
+    """
+    stmt, _ = search_filter_sort(model, stmt, filter_spec, sort_spec, fields)
+
+    # The statement is executed here, so that its errors are raised
+    # before anything is streamed.
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+    if selects_entity(stmt):
+        result = result.scalars()
+
+    return _iter_chunks(result, fields, chunk_size)
+
+
+async def _iter_chunks(result, fields, chunk_size):
+    async for items in result.partitions(chunk_size):
+        if fields:
+            items = get_field_items(items, fields)
+
+        yield items
@@ -0,0 +1,96 @@
+import re
+from contextlib import asynccontextmanager
+from typing import List
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.filters.models import get_valid_field_names
+
+UNIQUE_VIOLATION_PATTERNS = [
+    # SQLite, e.g. UNIQUE constraint failed: user_users.email
+    re.compile(r"UNIQUE constraint failed: (?P<columns>[\w.]+(, [\w.]+)*)"),
+    # PostgreSQL, e.g. Key (email)=(foo@bar.com) already exists.
+    re.compile(r"Key \((?P<columns>[^)]+)\)=\(.*\) already exists"),
+]
+
+
+async def validate_fields(*, fields: List[str], model, schema: BaseModel):
+    """Validate the fields of a sparse fieldset, which must be columns of
+    ``model`` returned by ``schema``."""
+    if not fields:
+        return
+
+    valid_fields = get_valid_field_names(model) & set(schema.__fields__)
+
+    detail = []
+    for field in fields:
+        if field not in valid_fields:
+            detail.append(
+                {
+                    "loc": ["query", "fields"],
+                    "msg": "field `{}` is not available".format(field),
+                    "type": "value_error.field",
+                }
+            )
+
+    if detail:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
+        )
+
+
+def get_unique_violation_fields(error: IntegrityError) -> List[str]:
+    """Get the columns of the unique constraint violated by ``error``, if
+    it is a unique violation."""
+    orig = error.orig
+
+    # The detail naming the columns is an attribute of the driver error,
+    # asyncpg's is wrapped by the SQLAlchemy adapter.
+    messages = [str(orig)]
+    for driver_error in [orig, getattr(orig, "__cause__", None)]:
+        diag = getattr(driver_error, "diag", None)
+        messages.append(getattr(driver_error, "detail", None))
+        messages.append(getattr(diag, "message_detail", None))
+
+    message = "\n".join(filter(None, messages))
+    for pattern in UNIQUE_VIOLATION_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return [
+                column.strip().split(".")[-1]
+                for column in match.group("columns").split(",")
+            ]
+
+    return []
+
+
+@asynccontextmanager
+async def validate_unique_constraints(*, session: AsyncSession):
+    """Report the unique constraints violated by the statements of the
+    block as the 422 ``value_error.unique`` detail of the validators.
+
+    Any other integrity error is raised as it is.
+    """
+    try:
+        yield
+    except IntegrityError as error:
+        fields = get_unique_violation_fields(error)
+        if not fields:
+            raise
+
+        await session.rollback()
+
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[
+                {
+                    "loc": ["body", field],
+                    "msg": "already exists",
+                    "type": "value_error.unique",
+                }
+                for field in fields
+            ],
+        )
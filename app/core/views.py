@@ -1,10 +1,11 @@
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Request, Response, status
 from fastapi.responses import HTMLResponse
 
 from app.config import get_settings
+from app.core.metrics import get_metrics
 from app.core.schemas import RootSchema
 from app.version import __version__
 
@@ -36,6 +37,17 @@ async def health_check():
     return {"status": "ok"}
 
 
+@router.get(
+    "/metrics",
+    summary="Application metrics.",
+    status_code=status.HTTP_200_OK,
+    include_in_schema=False,
+)
+async def metrics():
+    content, content_type = get_metrics()
+    return Response(content=content, media_type=content_type)
+
+
 @router.get(
     "/messages",
     summary="Show api messages.",
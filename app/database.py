@@ -1,15 +1,82 @@
+import asyncio
 import os
 
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from app.config import Settings, get_settings
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI")
+SQLALCHEMY_READ_DATABASE_URI = os.getenv("SQLALCHEMY_READ_DATABASE_URI")
+
+
+def get_engine_options(settings: Settings, database_uri: str) -> dict:
+    """Return the options of the engine connected to ``database_uri``."""
+    url = make_url(database_uri)
+    options = {
+        "echo": settings.SQLALCHEMY_ECHO,
+        "pool_pre_ping": settings.SQLALCHEMY_POOL_PRE_PING,
+    }
+
+    # SQLite is not served by a queue pool, which the sizing applies to.
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            {
+                "pool_size": settings.SQLALCHEMY_POOL_SIZE,
+                "max_overflow": settings.SQLALCHEMY_MAX_OVERFLOW,
+                "pool_timeout": settings.SQLALCHEMY_POOL_TIMEOUT,
+                "pool_recycle": settings.SQLALCHEMY_POOL_RECYCLE,
+            }
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": (
+                settings.SQLALCHEMY_STATEMENT_CACHE_SIZE
+            ),
+        }
+
+    return options
+
 
-engine = create_async_engine(SQLALCHEMY_DATABASE_URI, future=True, echo=True)
+async def warm_up_engine(engine, size: int):
+    """Open up to ``size`` connections and return them to the pool, so
+    that the first requests do not pay for the connection setup."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+
+    connections = await asyncio.gather(
+        *[engine.connect() for _ in range(min(size, pool.size()))]
+    )
+
+    for connection in connections:
+        await connection.close()
+
+
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URI,
+    future=True,
+    **get_engine_options(get_settings(), SQLALCHEMY_DATABASE_URI),
+)
 async_session = sessionmaker(
     bind=engine, expire_on_commit=False, class_=AsyncSession
 )
+
+# Optional replica which serves the read-only endpoints.
+read_engine = engine
+if SQLALCHEMY_READ_DATABASE_URI:
+    read_engine = create_async_engine(
+        SQLALCHEMY_READ_DATABASE_URI,
+        future=True,
+        **get_engine_options(get_settings(), SQLALCHEMY_READ_DATABASE_URI),
+    )
+async_read_session = sessionmaker(
+    bind=read_engine, expire_on_commit=False, class_=AsyncSession
+)
 Base = declarative_base()
@@ -1,16 +1,41 @@
 from functools import lru_cache
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import Settings
-from app.database import async_session
+from app.database import async_read_session, async_session
+
+READ_YOUR_WRITES_COOKIE = "read_your_writes"
 
 
 async def get_session() -> AsyncSession:
+    """Session of a request, whose statements run in a single transaction
+    begun by the first of them.
+
+    The services do not commit what they read, only the changes they
+    write, once and before the response is sent. Whatever is left, the
+    reads or the changes of a failed request, is rolled back when the
+    session is closed, which happens after the response.
+    """
     async with async_session() as session:
         yield session
 
 
+async def get_read_session(request: Request) -> AsyncSession:
+    """Session for read-only handlers, bound to the read engine.
+
+    Clients which have just written, and therefore carry the read your
+    writes cookie, are served by the primary engine instead.
+    """
+    session_maker = async_read_session
+    if READ_YOUR_WRITES_COOKIE in request.cookies:
+        session_maker = async_session
+
+    async with session_maker() as session:
+        yield session
+
+
 @lru_cache()
 def get_settings() -> Settings:
     return Settings()
@@ -1,7 +1,8 @@
 import logging
 from importlib import resources
 
-from fastapi import APIRouter, FastAPI
+from fastapi import APIRouter, FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from starlette.middleware import Middleware
@@ -11,7 +12,17 @@ from starlette_wtf import CSRFProtectMiddleware
 from app.account.routers import router as account_router
 from app.auth.views import router as oauth_router
 from app.config import get_settings
+from app.core.filters.exceptions import InvalidPage
+from app.core.filters.filters import add_filter_trace_hook, log_filter_trace
+from app.core.instrumentation import QueryStatsMiddleware, setup_query_stats
+from app.core.metrics import (
+    MetricsMiddleware,
+    setup_db_metrics,
+    setup_task_metrics,
+)
+from app.core.middleware import ReadYourWritesMiddleware
 from app.core.views import router as core_router
+from app.database import engine, read_engine, warm_up_engine
 from app.store.routers import router as store_router
 from app.version import __version__
 
@@ -33,6 +44,52 @@ app = FastAPI(
     ],
 )
 
+
+@app.exception_handler(InvalidPage)
+async def invalid_page_exception_handler(request: Request, exc: InvalidPage):
+    # Reported as the request validation errors are.
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={
+            "detail": [
+                {
+                    "loc": ["query", exc.param],
+                    "msg": str(exc),
+                    "type": "value_error.page",
+                }
+            ]
+        },
+    )
+
+
+if settings.FILTER_TRACE_ENABLE:
+    add_filter_trace_hook(log_filter_trace)
+
+if settings.QUERY_STATS_ENABLE:
+    setup_query_stats(engine)
+    if read_engine is not engine:
+        setup_query_stats(read_engine)
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.METRICS_ENABLE:
+    setup_db_metrics(engine)
+    if read_engine is not engine:
+        setup_db_metrics(read_engine, "replica")
+    setup_task_metrics()
+    app.add_middleware(MetricsMiddleware)
+
+if settings.SQLALCHEMY_READ_DATABASE_URI:
+    app.add_middleware(
+        ReadYourWritesMiddleware, max_age=settings.READ_YOUR_WRITES_SECONDS
+    )
+
+
+@app.on_event("startup")
+async def startup():
+    if settings.SQLALCHEMY_POOL_WARM_UP:
+        await warm_up_engine(engine, settings.SQLALCHEMY_POOL_SIZE)
+
+
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
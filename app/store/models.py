@@ -13,7 +13,7 @@ class Segment(
 ):
     __tablename__ = "store_segments"
 
-    title = sa.Column(sa.String, nullable=False)
+    title = sa.Column(sa.String, nullable=False, unique=True, index=True)
     is_active = sa.Column(sa.Boolean, nullable=False, default=True)
     image = sa.Column(sa.String, nullable=True)
     color = sa.Column(sa.String, nullable=True)
@@ -28,8 +28,8 @@ class Store(
 ):
     __tablename__ = "store_stores"
 
-    title = sa.Column(sa.String, nullable=False)
-    legal = sa.Column(sa.String, nullable=True)
+    title = sa.Column(sa.String, nullable=False, unique=True, index=True)
+    legal = sa.Column(sa.String, nullable=True, unique=True, index=True)
     external_data = sa.Column(sa.JSON, nullable=True)
     phones = sa.Column(sa.JSON, nullable=True)
     information = sa.Column(sa.JSON, nullable=True)
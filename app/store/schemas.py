@@ -3,7 +3,7 @@ from typing import List, Literal, Optional
 
 from pydantic import Field
 
-from app.address.schemas import AddressCreate
+from app.address.schemas import Address, AddressCreate
 from app.core.schemas import PaginationSchema, PhoneSchema, SchemaBase
 
 
@@ -63,11 +63,24 @@ class StoreUpdate(StoreBase):
     pass
 
 
+class StoreBulkItem(SchemaBase):
+    index: int
+    id: Optional[int] = None
+    detail: Optional[List[dict]] = None
+
+
+class StoreBulkResult(SchemaBase):
+    created: int
+    failed: int
+    items: List[StoreBulkItem]
+
+
 class Store(StoreBase):
     id: int
     created_at: datetime = datetime.utcnow()
     updated_at: datetime = datetime.utcnow()
     approved_at: Optional[datetime] = None
+    addresses: Optional[List[Address]] = None
 
     class Config:
         orm_mode = True
@@ -75,3 +88,18 @@ class Store(StoreBase):
 
 class StorePagination(PaginationSchema):
     items: List[Store]
+
+
+class StoreNearby(Store):
+    distance_km: float
+
+
+class StoreNearbyPagination(PaginationSchema):
+    items: List[StoreNearby]
+    truncated: bool = Field(
+        False,
+        description=(
+            "Whether only the nearest candidates were considered, in which "
+            "case the total and pages do not count every store nearby."
+        ),
+    )
@@ -31,7 +31,6 @@ async def get(
     """Get a segment by id."""
     query = await session.execute(select(Segment).filter_by(id=segment_id))
     segment = query.scalar_one_or_none()
-    await session.commit()
 
     return segment
 
@@ -1,13 +1,28 @@
-from typing import Optional
+import math
+from typing import List, Optional
 
 from fastapi.encoders import jsonable_encoder
+from sqlalchemy import and_, case, insert, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.account.schemas import Account
-from app.address.models import Address
+from app.address.geo import (
+    get_bounding_boxes,
+    get_cell_upper_bound,
+    get_covering_cells,
+    haversine_km,
+)
+from app.address.models import Address, get_geohash
+from app.config import get_settings
+from app.core.services import get_loader_options
+from app.core.validators import get_unique_violation_fields
 from app.store.models import Store, StorePerson
 from app.store.schemas import StoreCreate, StoreUpdate
+from app.store.validators import get_store_conflicts
+
+settings = get_settings()
 
 
 async def create(
@@ -42,15 +57,176 @@ async def create(
     return instance
 
 
+async def create_bulk(
+    *,
+    session: AsyncSession,
+    stores_in: List[StoreCreate],
+    owner: Account,
+    chunk_size: int = None,
+):
+    """Create many stores, skipping the ones whose unique fields are
+    already taken, and report the result of each of them.
+
+    The stores are validated and inserted a chunk at a time, with a
+    single statement for each of the stores, owners and addresses of the
+    chunk. Every store is created in a single transaction, unless
+    ``chunk_size`` is given, in which case each chunk of ``chunk_size``
+    stores is committed on its own.
+
+    Each chunk is inserted in a savepoint. When a unique constraint is
+    violated anyway, by a store created concurrently, only the chunk is
+    rolled back and its stores are inserted again one at a time, each in
+    its own savepoint, the offending ones being reported with the
+    violated fields.
+    """
+    items = []
+
+    size = chunk_size or settings.BULK_CHUNK_SIZE
+    for offset in range(0, len(stores_in), size):
+        chunk_slice = slice(offset, offset + size)
+        chunk = stores_in[chunk_slice]
+        conflicts = await get_store_conflicts(session=session, stores_in=chunk)
+
+        created = [
+            store_in
+            for store_in, detail in zip(chunk, conflicts)
+            if not detail
+        ]
+        try:
+            async with session.begin_nested():
+                ids = await _insert_stores(
+                    session=session, stores_in=created, owner=owner
+                )
+        except IntegrityError as error:
+            if not get_unique_violation_fields(error):
+                raise
+
+            # The stores of the chunk are retried one at a time, so that
+            # only the ones violating a unique constraint are reported.
+            ids, violations = {}, {}
+            for store_in in created:
+                try:
+                    async with session.begin_nested():
+                        ids.update(
+                            await _insert_stores(
+                                session=session,
+                                stores_in=[store_in],
+                                owner=owner,
+                            )
+                        )
+                except IntegrityError as error:
+                    fields = get_unique_violation_fields(error)
+                    if not fields:
+                        raise
+
+                    violations[store_in.document_number] = [
+                        {
+                            "loc": ["body", field],
+                            "msg": "already exists",
+                            "type": "value_error.unique",
+                        }
+                        for field in fields
+                    ]
+
+            conflicts = [
+                detail or violations.get(store_in.document_number, [])
+                for store_in, detail in zip(chunk, conflicts)
+            ]
+
+        for index, (store_in, detail) in enumerate(
+            zip(chunk, conflicts), start=offset
+        ):
+            items.append(
+                {
+                    "index": index,
+                    "id": None if detail else ids[store_in.document_number],
+                    "detail": detail or None,
+                }
+            )
+
+        if chunk_size:
+            await session.commit()
+
+    await session.commit()
+
+    created_count = len([item for item in items if item["id"] is not None])
+
+    return {
+        "created": created_count,
+        "failed": len(items) - created_count,
+        "items": items,
+    }
+
+
+async def _insert_stores(
+    *, session: AsyncSession, stores_in: List[StoreCreate], owner: Account
+):
+    if not stores_in:
+        return {}
+
+    stmt = insert(Store).values(
+        [store_in.dict(exclude={"addresses"}) for store_in in stores_in]
+    )
+
+    # The ids are mapped back by document number, which is unique, as the
+    # order of the returned rows is not guaranteed. Without RETURNING, on
+    # SQLite, they are selected afterwards.
+    if session.get_bind().dialect.full_returning:
+        query = await session.execute(
+            stmt.returning(Store.id, Store.document_number)
+        )
+    else:
+        await session.execute(stmt)
+        query = await session.execute(
+            select(Store.id, Store.document_number).where(
+                Store.document_number.in_(
+                    [store_in.document_number for store_in in stores_in]
+                )
+            )
+        )
+    ids = {row.document_number: row.id for row in query}
+
+    await session.execute(
+        insert(StorePerson),
+        [
+            {
+                "store_id": ids[store_in.document_number],
+                "user_id": owner.id,
+                "is_owner": True,
+            }
+            for store_in in stores_in
+        ],
+    )
+
+    addresses = [
+        {
+            **address_in.dict(),
+            "geohash": get_geohash(address_in.lat, address_in.lng),
+            "discriminator": "store",
+            "parent_id": ids[store_in.document_number],
+        }
+        for store_in in stores_in
+        for address_in in store_in.addresses or []
+    ]
+    if addresses:
+        await session.execute(insert(Address), addresses)
+
+    return ids
+
+
 async def get(
     *,
     session: AsyncSession,
     store_id: int,
+    include: List[str] = None,
 ) -> Optional[Store]:
     """Get a store by id."""
-    query = await session.execute(select(Store).filter_by(id=store_id))
+    query = await session.execute(
+        select(Store)
+        .filter_by(id=store_id)
+        .options(*get_loader_options(Store, include))
+    )
     store = query.scalar_one_or_none()
-    await session.commit()
 
     return store
 
@@ -75,3 +251,99 @@ async def delete(*, session: AsyncSession, store: Store):
     """Delete a store."""
     await session.delete(store)
     await session.commit()
+
+
+async def search_nearby(
+    *,
+    session: AsyncSession,
+    lat: float,
+    lng: float,
+    radius_km: float,
+    page: int = 1,
+    items_per_page: int = 5,
+):
+    """Search the stores with an address within ``radius_km`` of a
+    coordinate, ordered by distance.
+
+    The candidates are pruned by the geohash cells covering the radius,
+    with index range scans, and by the bounding box of the radius. At most
+    ``NEARBY_MAX_CANDIDATES`` of the nearest ones are loaded, by an
+    approximate distance, and the exact haversine distance is computed
+    only for them. The result is then ``truncated``: its total and pages
+    only count the stores among those candidates.
+    """
+    cells = get_covering_cells(lat, lng, radius_km)
+    boxes = get_bounding_boxes(lat, lng, radius_km)
+
+    cell_clauses = []
+    for cell in cells:
+        upper_bound = get_cell_upper_bound(cell)
+        if upper_bound is None:
+            cell_clauses.append(Address.geohash >= cell)
+        else:
+            cell_clauses.append(
+                and_(Address.geohash >= cell, Address.geohash < upper_bound)
+            )
+
+    # The approximate distance is the equirectangular one, in degrees,
+    # with the longitudes wrapped across the antimeridian.
+    lat_delta = Address.lat - lat
+    lng_delta = case(
+        (Address.lng - lng > 180, Address.lng - lng - 360),
+        (Address.lng - lng < -180, Address.lng - lng + 360),
+        else_=Address.lng - lng,
+    ) * math.cos(math.radians(lat))
+
+    query = await session.execute(
+        select(Store, Address.lat, Address.lng)
+        .join(
+            Address,
+            and_(
+                Address.discriminator == "store",
+                Address.parent_id == Store.id,
+            ),
+        )
+        .where(
+            or_(*cell_clauses),
+            or_(
+                *[
+                    and_(
+                        Address.lat.between(min_lat, max_lat),
+                        Address.lng.between(min_lng, max_lng),
+                    )
+                    for min_lat, min_lng, max_lat, max_lng in boxes
+                ]
+            ),
+        )
+        .order_by(lat_delta * lat_delta + lng_delta * lng_delta)
+        .limit(settings.NEARBY_MAX_CANDIDATES + 1)
+    )
+    rows = query.all()
+
+    # One extra row is fetched to know whether there are more candidates.
+    truncated = len(rows) > settings.NEARBY_MAX_CANDIDATES
+    rows = rows[: settings.NEARBY_MAX_CANDIDATES]
+
+    # A store is as near as the nearest of its addresses.
+    distances = {}
+    for store, store_lat, store_lng in rows:
+        distance = haversine_km(lat, lng, store_lat, store_lng)
+        if distance <= radius_km and distance < distances.get(store, math.inf):
+            distances[store] = distance
+
+    stores = sorted(distances, key=lambda store: (distances[store], store.id))
+    for store in stores:
+        store.distance_km = round(distances[store], 3)
+
+    offset = (page - 1) * items_per_page
+    page_slice = slice(offset, offset + items_per_page)
+
+    return {
+        "items": stores[page_slice],
+        "per_page": items_per_page,
+        "num_pages": math.ceil(len(stores) / items_per_page),
+        "page": page,
+        "total": len(stores),
+        "has_next": offset + items_per_page < len(stores),
+        "truncated": truncated,
+    }
@@ -1,18 +1,25 @@
+from typing import List
+
 from fastapi import HTTPException, status
 from sqlalchemy import func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from app.account.schemas import Account
+from app.config import get_settings
 from app.store.models import Segment as SegmentModel
 from app.store.models import Store as StoreModel
 from app.store.models import StorePerson
-from app.store.schemas import Segment, Store
+from app.store.schemas import Segment, Store, StoreCreate
 
 
 async def validate_segment(
     *, session: AsyncSession, segment_in: Segment, segment: Segment = None
 ):
+    if get_settings().UNIQUE_VALIDATION == "constraint":
+        # The violations are reported by validate_unique_constraints.
+        return
+
     clauses = []
     for field in ["title"]:
         if getattr(segment_in, field) is not None:
@@ -30,8 +37,6 @@ async def validate_segment(
 
     query = await session.execute(stmt.with_only_columns(func.count()))
 
-    await session.commit()
-
     if query.scalar_one():
         detail = []
         for clause in clauses:
@@ -52,6 +57,10 @@ async def validate_segment(
 async def validate_store(
     *, session: AsyncSession, store_in: Store, store: Store = None
 ):
+    if get_settings().UNIQUE_VALIDATION == "constraint":
+        # The violations are reported by validate_unique_constraints.
+        return
+
     clauses = []
     for field in ["title", "legal", "document_number"]:
         if getattr(store_in, field) is not None:
@@ -69,8 +78,6 @@ async def validate_store(
 
     query = await session.execute(stmt.with_only_columns(func.count()))
 
-    await session.commit()
-
     if query.scalar_one():
         detail = []
         for clause in clauses:
@@ -88,6 +95,61 @@ async def validate_store(
         )
 
 
+async def get_store_conflicts(
+    *, session: AsyncSession, stores_in: List[StoreCreate]
+):
+    """Get the unique fields of each of ``stores_in`` which are already
+    taken, by an existing store or by a previous one of ``stores_in``.
+
+    The existing stores are searched with a single query. The session is
+    not committed, the caller owns the transaction.
+    """
+    fields = ["title", "legal", "document_number"]
+
+    clauses = []
+    for field in fields:
+        values = {
+            getattr(store_in, field)
+            for store_in in stores_in
+            if getattr(store_in, field) is not None
+        }
+        if values:
+            clauses.append(getattr(StoreModel, field).in_(values))
+
+    taken = {field: set() for field in fields}
+    if clauses:
+        query = await session.execute(
+            select(*[getattr(StoreModel, field) for field in fields]).where(
+                or_(*clauses)
+            )
+        )
+        for row in query:
+            for field in fields:
+                taken[field].add(getattr(row, field))
+
+    conflicts = []
+    for store_in in stores_in:
+        detail = [
+            {
+                "loc": ["body", field],
+                "msg": "already exists",
+                "type": "value_error.unique",
+            }
+            for field in fields
+            if getattr(store_in, field) is not None
+            and getattr(store_in, field) in taken[field]
+        ]
+
+        # Only the stores which are created take their values.
+        if not detail:
+            for field in fields:
+                taken[field].add(getattr(store_in, field))
+
+        conflicts.append(detail)
+
+    return conflicts
+
+
 async def validate_store_owner_or_admin(
     *, session: AsyncSession, account: Account, store: Store
 ):
@@ -98,7 +160,6 @@ async def validate_store_owner_or_admin(
         StorePerson.is_active,
     )
     query = await session.execute(stmt.with_only_columns(func.count()))
-    await session.commit()
 
     if not query.scalar_one() and not account.is_admin:
         raise HTTPException(
@@ -8,15 +8,27 @@ from app.account.schemas import Account
 from app.address.models import Address as AddressModel
 from app.address.schemas import (
     Address,
+    AddressBatch,
+    AddressBatchResult,
     AddressCreate,
     AddressPagination,
     AddressUpdate,
 )
-from app.address.services import create, delete, get, update
+from app.address.services import (
+    batch,
+    create,
+    delete,
+    get,
+    select_by_parent,
+    update,
+)
+from app.address.validators import validate_address_batch
 from app.auth.depends import current_user_verified
 from app.core.depends import pagination_parameters
+from app.core.responses import SchemaJSONResponse
 from app.core.services import search_filter_sort_paginate
-from app.depends import get_session
+from app.core.validators import validate_fields
+from app.depends import get_read_session, get_session
 from app.store.services.store import get as get_store
 from app.store.validators import validate_store_owner_or_admin
 
@@ -80,23 +92,21 @@ async def create_store_address(
 )
 async def get_store_addresses(
     *,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     common: dict = Depends(pagination_parameters),
     store_id: int,
 ):
-    common["filter_spec"].append(
-        {
-            "model": "Address",
-            "field": "parent_id",
-            "op": "eq",
-            "value": store_id,
-        }
-    )
-
     logger.info(f"Starting get store addresses with={common}")
 
+    await validate_fields(
+        fields=common["fields"], model=AddressModel, schema=Address
+    )
+
     pagination = await search_filter_sort_paginate(
-        session=session, model=AddressModel, **common
+        session=session,
+        model=AddressModel,
+        stmt=select_by_parent(parent_id=store_id, discriminator="store"),
+        **common,
     )
 
     logger.info(
@@ -112,7 +122,61 @@ async def get_store_addresses(
         )
     )
 
-    return pagination
+    # Sparse items are returned as they are, the others are mapped to the
+    # fields of the response model without being validated against it.
+    return SchemaJSONResponse(
+        pagination, schema=None if common["fields"] else AddressPagination
+    )
+
+
+@router.put(
+    "/stores/{store_id}/addresses:batch",
+    summary="Batch store addresses.",
+    response_model=AddressBatchResult,
+)
+async def batch_store_addresses(
+    *,
+    session: AsyncSession = Depends(get_session),
+    store_id: int,
+    batch_in: AddressBatch,
+    account: Account = Depends(current_user_verified),
+):
+    logger.info(
+        "Starting batch store addresses with={}".format(
+            {
+                "store_id": store_id,
+                "batch_in": batch_in,
+                "owner_in": account.id,
+            }
+        )
+    )
+
+    store = await get_store(session=session, store_id=store_id)
+    if not store:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Not Found."
+        )
+
+    await validate_store_owner_or_admin(
+        session=session, store=store, account=account
+    )
+    await validate_address_batch(
+        session=session, batch_in=batch_in, parent=store
+    )
+
+    result = await batch(session=session, batch_in=batch_in, parent=store)
+
+    logger.info(
+        "Store addresses batched successfully with={}".format(
+            {
+                "store_id": store_id,
+                "created": result["created"],
+                "updated": result["updated"],
+                "deleted": result["deleted"],
+            }
+        )
+    )
+    return result
 
 
 @router.get(
@@ -123,7 +187,7 @@ async def get_store_addresses(
 )
 async def get_store_address(
     *,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     store_id: int,
     address_id: int,
 ):
@@ -5,9 +5,14 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.depends import current_user_admin, current_user_verified
-from app.core.depends import pagination_parameters
-from app.core.services import search_filter_sort_paginate
-from app.depends import get_session
+from app.core.depends import export_parameters, pagination_parameters
+from app.core.responses import ExportStreamingResponse, SchemaJSONResponse
+from app.core.services import (
+    search_filter_sort_paginate,
+    search_filter_sort_stream,
+)
+from app.core.validators import validate_fields, validate_unique_constraints
+from app.depends import get_read_session, get_session
 from app.store.models import Segment as SegmentModel
 from app.store.schemas import (
     Segment,
@@ -42,7 +47,8 @@ async def create_segment(
 
     await validate_segment(session=session, segment_in=segment_in)
 
-    segment = await create(session=session, segment_in=segment_in)
+    async with validate_unique_constraints(session=session):
+        segment = await create(session=session, segment_in=segment_in)
     logger.info(
         "Segment created successfully with={}".format(
             {
@@ -60,11 +66,15 @@ async def create_segment(
 )
 async def get_segments(
     *,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     common: dict = Depends(pagination_parameters),
 ):
     logger.info(f"Starting get segments with={common}")
 
+    await validate_fields(
+        fields=common["fields"], model=SegmentModel, schema=Segment
+    )
+
     pagination = await search_filter_sort_paginate(
         session=session, model=SegmentModel, **common
     )
@@ -82,7 +92,44 @@ async def get_segments(
         )
     )
 
-    return pagination
+    # Sparse items are returned as they are, the others are mapped to the
+    # fields of the response model without being validated against it.
+    return SchemaJSONResponse(
+        pagination, schema=None if common["fields"] else SegmentPagination
+    )
+
+
+@router.get(
+    "/segments/export",
+    summary="Export segments.",
+    response_class=ExportStreamingResponse,
+)
+async def export_segments(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    common: dict = Depends(export_parameters),
+):
+    logger.info(f"Starting export segments with={common}")
+
+    await validate_fields(
+        fields=common["fields"], model=SegmentModel, schema=Segment
+    )
+
+    chunks = await search_filter_sort_stream(
+        session=session,
+        model=SegmentModel,
+        filter_spec=common["filter_spec"],
+        sort_spec=common["sort_spec"],
+        fields=common["fields"],
+    )
+
+    return ExportStreamingResponse(
+        chunks,
+        common["export_format"],
+        schema=Segment,
+        fields=common["fields"],
+        filename="segments",
+    )
 
 
 @router.get(
@@ -92,7 +139,7 @@ async def get_segments(
     response_model=Segment,
 )
 async def get_segment(
-    *, session: AsyncSession = Depends(get_session), segment_id: int
+    *, session: AsyncSession = Depends(get_read_session), segment_id: int
 ):
     logger.info(
         "Starting get segment with={}".format(
@@ -152,9 +199,10 @@ async def update_segment(
         session=session, segment_in=segment_in, segment=segment
     )
 
-    segment = await update(
-        session=session, segment_in=segment_in, segment=segment
-    )
+    async with validate_unique_constraints(session=session):
+        segment = await update(
+            session=session, segment_in=segment_in, segment=segment
+        )
     logger.info(
         "Segment updated successfully with={}".format(
             {
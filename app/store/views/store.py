@@ -1,17 +1,42 @@
 import logging
+from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.account.schemas import Account
 from app.auth.depends import current_user_verified
-from app.core.depends import pagination_parameters
-from app.core.services import search_filter_sort_paginate
-from app.depends import get_session
+from app.config import get_settings
+from app.core.depends import (
+    export_parameters,
+    include_parameters,
+    pagination_parameters,
+)
+from app.core.responses import ExportStreamingResponse, SchemaJSONResponse
+from app.core.services import (
+    search_filter_sort_paginate,
+    search_filter_sort_stream,
+)
+from app.core.validators import validate_fields, validate_unique_constraints
+from app.depends import get_read_session, get_session
 from app.store.models import Store as StoreModel
-from app.store.schemas import Store, StoreCreate, StorePagination, StoreUpdate
-from app.store.services.store import create, delete, get, update
+from app.store.schemas import (
+    Store,
+    StoreBulkResult,
+    StoreCreate,
+    StoreNearbyPagination,
+    StorePagination,
+    StoreUpdate,
+)
+from app.store.services.store import (
+    create,
+    create_bulk,
+    delete,
+    get,
+    search_nearby,
+    update,
+)
 from app.store.validators import validate_store, validate_store_owner_or_admin
 
 router = APIRouter()
@@ -41,7 +66,8 @@ async def create_store(
 
     await validate_store(session=session, store_in=store_in)
 
-    store = await create(session=session, store_in=store_in, owner=account)
+    async with validate_unique_constraints(session=session):
+        store = await create(session=session, store_in=store_in, owner=account)
     logger.info(
         "Store created successfully with={}".format(
             {
@@ -53,6 +79,68 @@ async def create_store(
     return store
 
 
+@router.post(
+    "/stores/bulk",
+    summary="Create stores in bulk.",
+    response_model=StoreBulkResult,
+)
+async def create_stores_bulk(
+    *,
+    session: AsyncSession = Depends(get_session),
+    stores_in: List[StoreCreate],
+    chunk_size: int = Query(
+        None,
+        alias="chunkSize",
+        ge=1,
+        description="Commit the stores in chunks of this size, all of "
+        "them are committed in a single transaction otherwise.",
+    ),
+    account: Account = Depends(current_user_verified),
+):
+    settings = get_settings()
+
+    logger.info(
+        "Starting create stores bulk with={}".format(
+            {
+                "stores_in": len(stores_in),
+                "chunk_size": chunk_size,
+                "owner_id": account.id,
+            }
+        )
+    )
+
+    if len(stores_in) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[
+                {
+                    "loc": ["body"],
+                    "msg": "ensure this value has at most {} items".format(
+                        settings.BULK_MAX_ITEMS
+                    ),
+                    "type": "value_error.list.max_items",
+                }
+            ],
+        )
+
+    result = await create_bulk(
+        session=session,
+        stores_in=stores_in,
+        owner=account,
+        chunk_size=chunk_size,
+    )
+    logger.info(
+        "Stores bulk created successfully with={}".format(
+            {
+                "created": result["created"],
+                "failed": result["failed"],
+                "owner_id": account.id,
+            }
+        )
+    )
+    return result
+
+
 @router.get(
     "/stores",
     summary="Get stores.",
@@ -60,13 +148,18 @@ async def create_store(
 )
 async def get_stores(
     *,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     common: dict = Depends(pagination_parameters),
+    include: list = Depends(include_parameters),
 ):
     logger.info(f"Starting get stores with={common}")
 
+    await validate_fields(
+        fields=common["fields"], model=StoreModel, schema=Store
+    )
+
     pagination = await search_filter_sort_paginate(
-        session=session, model=StoreModel, **common
+        session=session, model=StoreModel, include=include, **common
     )
 
     logger.info(
@@ -82,7 +175,87 @@ async def get_stores(
         )
     )
 
-    return pagination
+    # Sparse items are returned as they are, the others are mapped to the
+    # fields of the response model without being validated against it.
+    return SchemaJSONResponse(
+        pagination, schema=None if common["fields"] else StorePagination
+    )
+
+
+@router.get(
+    "/stores/nearby",
+    summary="Get stores nearby.",
+    response_model=StoreNearbyPagination,
+)
+async def get_stores_nearby(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    lat: float = Query(..., ge=-90, le=90),
+    lng: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5, gt=0, le=100),
+    page: int = Query(1, ge=1),
+    items_per_page: int = Query(5, alias="itemsPerPage", ge=1),
+):
+    settings = get_settings()
+    parameters = {
+        "lat": lat,
+        "lng": lng,
+        "radius_km": radius_km,
+        "page": page,
+        "items_per_page": min(items_per_page, settings.MAX_ITEMS_PER_PAGE),
+    }
+
+    logger.info(f"Starting get stores nearby with={parameters}")
+
+    pagination = await search_nearby(session=session, **parameters)
+
+    logger.info(
+        "Stores nearby got successfully with={}".format(
+            {
+                "page": pagination["page"],
+                "items": len(pagination["items"]),
+                "per_page": pagination["per_page"],
+                "parameters": parameters,
+                "num_pages": pagination["num_pages"],
+                "total": pagination["total"],
+            }
+        )
+    )
+
+    return SchemaJSONResponse(pagination, schema=StoreNearbyPagination)
+
+
+@router.get(
+    "/stores/export",
+    summary="Export stores.",
+    response_class=ExportStreamingResponse,
+)
+async def export_stores(
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    common: dict = Depends(export_parameters),
+):
+    logger.info(f"Starting export stores with={common}")
+
+    await validate_fields(
+        fields=common["fields"], model=StoreModel, schema=Store
+    )
+
+    chunks = await search_filter_sort_stream(
+        session=session,
+        model=StoreModel,
+        filter_spec=common["filter_spec"],
+        sort_spec=common["sort_spec"],
+        fields=common["fields"],
+    )
+
+    return ExportStreamingResponse(
+        chunks,
+        common["export_format"],
+        schema=Store,
+        fields=common["fields"],
+        filename="stores",
+    )
 
 
 @router.get(
@@ -92,17 +265,21 @@ async def get_stores(
     response_model=Store,
 )
 async def get_store(
-    *, session: AsyncSession = Depends(get_session), store_id: int
+    *,
+    session: AsyncSession = Depends(get_read_session),
+    store_id: int,
+    include: list = Depends(include_parameters),
 ):
     logger.info(
         "Starting get store with={}".format(
             {
                 "store_id": store_id,
+                "include": include,
             }
         )
     )
 
-    store = await get(session=session, store_id=store_id)
+    store = await get(session=session, store_id=store_id, include=include)
     if not store:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Not Found."
@@ -153,7 +330,8 @@ async def update_store(
 
     await validate_store(session=session, store_in=store_in, store=store)
 
-    store = await update(session=session, store_in=store_in, store=store)
+    async with validate_unique_constraints(session=session):
+        store = await update(session=session, store_in=store_in, store=store)
     logger.info(
         "Store updated successfully with={}".format(
             {
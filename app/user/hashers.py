@@ -0,0 +1,223 @@
+import abc
+import asyncio
+import base64
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from hmac import compare_digest as compare_hash
+from time import perf_counter
+from typing import Optional
+
+from app.config import get_settings
+from app.core.metrics import PASSWORD_HASH_DURATION, PASSWORD_HASH_QUEUE_DEPTH
+
+try:
+    import crypt
+except ImportError:  # pragma: no cover, removed in Python 3.13
+    crypt = None
+
+
+class PasswordHasher(abc.ABC):
+    """Hash and verify passwords, encoded with the ``algorithm`` of the
+    hasher as their prefix."""
+
+    algorithm = None
+
+    @abc.abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash ``password``, return it encoded."""
+
+    @abc.abstractmethod
+    def verify(self, password: str, encoded: str) -> bool:
+        """Return whether ``password`` matches ``encoded``."""
+
+    @abc.abstractmethod
+    def get_salt(self, encoded: str) -> str:
+        """Get the salt ``encoded`` was hashed with."""
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Return whether ``encoded`` was hashed with a different cost
+        than the one of the hasher."""
+        return False
+
+    def identify(self, encoded: str) -> bool:
+        return encoded.startswith(self.algorithm)
+
+
+class ScryptHasher(PasswordHasher):
+    """Hash the passwords with scrypt, encoded as
+    ``scrypt$n$r$p$salt$hash``."""
+
+    algorithm = "scrypt$"
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1):
+        self.n, self.r, self.p = n, r, p
+
+    def _scrypt(self, password, salt, n, r, p):
+        # The memory needed is 128 * n * r bytes, plus some headroom.
+        return hashlib.scrypt(
+            password.encode(),
+            salt=salt.encode(),
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r,
+        )
+
+    def hash(self, password: str) -> str:
+        salt = base64.b64encode(os.urandom(16)).decode()
+        digest = self._scrypt(password, salt, self.n, self.r, self.p)
+
+        return "scrypt${}${}${}${}${}".format(
+            self.n, self.r, self.p, salt, base64.b64encode(digest).decode()
+        )
+
+    def verify(self, password: str, encoded: str) -> bool:
+        try:
+            _, n, r, p, salt, digest = encoded.split("$")
+            expected = self._scrypt(password, salt, int(n), int(r), int(p))
+        except ValueError:
+            # Malformed, or with a cost which scrypt does not accept.
+            return False
+
+        return compare_hash(base64.b64encode(expected).decode(), digest)
+
+    def get_salt(self, encoded: str) -> str:
+        return encoded.split("$")[4]
+
+    def needs_rehash(self, encoded: str) -> bool:
+        _, n, r, p, _, _ = encoded.split("$")
+        return (int(n), int(r), int(p)) != (self.n, self.r, self.p)
+
+
+class CryptHasher(PasswordHasher):
+    """Hash the passwords with the SHA-256 method of ``crypt``, which the
+    legacy passwords are hashed with."""
+
+    algorithm = "$5$"
+
+    def hash(self, password: str) -> str:
+        return crypt.crypt(password, crypt.mksalt(crypt.METHOD_SHA256))
+
+    def verify(self, password: str, encoded: str) -> bool:
+        if crypt is None:
+            return False
+
+        return compare_hash(crypt.crypt(password, encoded), encoded)
+
+    def get_salt(self, encoded: str) -> str:
+        return encoded.rsplit("$", 1)[0]
+
+
+def get_hashers():
+    """Get the hashers by name, the one named by the
+    ``PASSWORD_HASHER`` setting hashes the new passwords."""
+    settings = get_settings()
+
+    return {
+        "scrypt": ScryptHasher(
+            n=settings.PASSWORD_SCRYPT_N,
+            r=settings.PASSWORD_SCRYPT_R,
+            p=settings.PASSWORD_SCRYPT_P,
+        ),
+        "crypt": CryptHasher(),
+    }
+
+
+def get_hasher(encoded: str = None) -> Optional[PasswordHasher]:
+    """Get the hasher which ``encoded`` was hashed with, ``None`` when no
+    hasher identifies it, or the one which hashes the new passwords when
+    ``encoded`` is not given."""
+    hashers = get_hashers()
+
+    if encoded is None:
+        return hashers[get_settings().PASSWORD_HASHER]
+
+    for hasher in hashers.values():
+        if hasher.identify(encoded):
+            return hasher
+
+    return None
+
+
+def make_password(password: str):
+    """Hash ``password``, return the encoded hash along with its salt.
+
+    It blocks for as long as the hasher takes, async code should use
+    :func:`hash_password` instead.
+    """
+    hasher = get_hasher()
+    encoded = hasher.hash(password)
+
+    return encoded, hasher.get_salt(encoded)
+
+
+def check_password(password: str, encoded: str):
+    """Verify ``password`` against ``encoded``, return whether it matches
+    along with its new hash and salt, when it must be rehashed with the
+    current hasher or cost.
+
+    It blocks for as long as the hasher takes, async code should use
+    :func:`verify_password` instead.
+    """
+    hasher = get_hasher(encoded)
+
+    # A hash of an unknown algorithm, or not a hash at all, matches nothing.
+    if hasher is None or not hasher.verify(password, encoded):
+        return False, None
+
+    current = get_hasher()
+    if current.algorithm != hasher.algorithm or current.needs_rehash(encoded):
+        return True, make_password(password)
+
+    return True, None
+
+
+_executor = None
+
+
+def get_executor():
+    """Get the pool of threads which the passwords are hashed in, sized by
+    the ``PASSWORD_HASH_WORKERS`` setting."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=get_settings().PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hasher",
+        )
+
+    return _executor
+
+
+async def _run_in_executor(operation, fn, *args):
+    def run():
+        PASSWORD_HASH_QUEUE_DEPTH.dec()
+        started_at = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_DURATION.labels(operation).observe(
+                perf_counter() - started_at
+            )
+
+    PASSWORD_HASH_QUEUE_DEPTH.inc()
+    future = get_executor().submit(run)
+
+    # A future is only cancelled before it runs.
+    future.add_done_callback(
+        lambda future: future.cancelled() and PASSWORD_HASH_QUEUE_DEPTH.dec()
+    )
+
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password(password: str):
+    """Hash ``password`` in the hashing pool, see :func:`make_password`."""
+    return await _run_in_executor("hash", make_password, password)
+
+
+async def verify_password(password: str, encoded: str):
+    """Verify ``password`` in the hashing pool, see
+    :func:`check_password`."""
+    return await _run_in_executor("verify", check_password, password, encoded)
@@ -1,6 +1,4 @@
-import crypt
 from datetime import datetime
-from hmac import compare_digest as compare_hash
 
 import sqlalchemy as sa
 from sqlalchemy.orm import relationship
@@ -8,6 +6,7 @@ from sqlalchemy.orm import relationship
 from app.address.models import HasAddresses
 from app.core.models import ModelMixin, TimestampMixin
 from app.database import Base
+from app.user import hashers
 
 
 class User(
@@ -35,20 +34,28 @@ class User(
     stores = relationship(
         "StorePerson", back_populates="user", cascade="all, delete"
     )
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user", cascade="all, delete"
+    )
 
     # define password getter
     @property
     def password(self):
         return self._password
 
-    # define password setter
+    # define password setter, which hashes in the calling thread, async
+    # code hashes with app.user.hashers.hash_password instead
     @password.setter
     def password(self, value):
-        self.salt = crypt.mksalt(crypt.METHOD_SHA256)
-        self._password = crypt.crypt(value, self.salt)
+        self.set_password_hash(*hashers.make_password(value))
+
+    def set_password_hash(self, encoded, salt):
+        self._password = encoded
+        self.salt = salt
 
     def check_password(self, password):
-        return compare_hash(crypt.crypt(password, self.salt), self.password)
+        is_valid, _ = hashers.check_password(password, self.password)
+        return is_valid
 
 
 class PasswordReset(
@@ -61,3 +68,43 @@ class PasswordReset(
     token = sa.Column(sa.String(), nullable=False)
     created_at = sa.Column(sa.DateTime, default=datetime.now)
     expire_at = sa.Column(sa.DateTime, nullable=False)
+
+
+class RefreshToken(
+    Base,
+    ModelMixin,
+):
+    __tablename__ = "user_refresh_tokens"
+
+    user_id = sa.Column(
+        sa.Integer, sa.ForeignKey("user_users.id"), nullable=False, index=True
+    )
+    token_hash = sa.Column(sa.String(64), nullable=False, unique=True)
+    """SHA-256 of the token, which is never stored."""
+
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+    expire_at = sa.Column(sa.DateTime, nullable=False)
+    revoked_at = sa.Column(sa.DateTime, nullable=True)
+    """Set once the token is rotated or revoked."""
+
+    user = relationship("User", back_populates="refresh_tokens")
+
+
+class RevokedToken(
+    Base,
+    ModelMixin,
+):
+    __tablename__ = "user_revoked_tokens"
+
+    jti = sa.Column(sa.String(64), nullable=False, unique=True)
+    """Identifier of the revoked access token."""
+
+    user_id = sa.Column(
+        sa.Integer,
+        sa.ForeignKey("user_users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    created_at = sa.Column(sa.DateTime, default=datetime.now)
+    expire_at = sa.Column(sa.DateTime, nullable=False, index=True)
+    """Expiration of the token, after which it no longer needs to be
+    revoked."""
@@ -6,7 +6,7 @@ from httpx import AsyncClient
 
 from app.account.schemas import AccountCreate
 from app.account.services.account import create
-from app.auth.services import create_access_token
+from app.auth.services import CURRENT_USERS, create_access_token
 from app.database import async_session
 from app.main import api_router
 from app.user.models import User
@@ -156,6 +156,68 @@ async def test_account_view_should_get_account(
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+@pytest.mark.asyncio
+async def test_account_view_should_get_account_including_addresses(
+    client: AsyncClient,
+):
+    """Test account view should get account including addresses."""
+    user = await UserFactory.create(
+        email_verified_at=datetime.now(),
+        addresses=[await AddressFactory.build()],
+    )
+    token = await create_access_token(user=user)
+
+    response = await client.get(
+        api_router.url_path_for("get_account"),
+        params={"include": "addresses"},
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["addresses"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_account_view_should_get_cached_account(client: AsyncClient):
+    """Test account view should get cached account."""
+    user = await UserFactory.create(
+        email_verified_at=datetime.now(),
+        addresses=[await AddressFactory.build()],
+    )
+    token = await create_access_token(user=user)
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    response = await client.get(
+        api_router.url_path_for("get_account"), headers=headers
+    )
+    cached_response = await client.get(
+        api_router.url_path_for("get_account"), headers=headers
+    )
+
+    assert CURRENT_USERS.info()["hits"] == 1
+    assert cached_response.json() == response.json()
+
+    await client.put(
+        api_router.url_path_for("update_account"),
+        json={"name": "Updated name"},
+        headers=headers,
+    )
+    response = await client.get(
+        api_router.url_path_for("get_account"), headers=headers
+    )
+
+    assert response.json()["name"] == "Updated name"
+
+    await client.delete(
+        api_router.url_path_for("delete_account"), headers=headers
+    )
+    response = await client.get(
+        api_router.url_path_for("get_account"), headers=headers
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("email_verified_at", [None, datetime.now()])
 async def test_account_view_should_update_account(
@@ -47,7 +47,9 @@ async def test_account_view_should_create_address(
         assert response.status_code == status.HTTP_201_CREATED
 
         async with async_session() as session:
-            account = await get(session=session, account_id=user.id)
+            account = await get(
+                session=session, account_id=user.id, include=["addresses"]
+            )
             assert account.addresses[0].postcode == data["postcode"]
     else:
         assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -185,3 +187,43 @@ async def test_account_view_should_delete_address(
         assert response.status_code == status.HTTP_204_NO_CONTENT
     else:
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_account_view_should_batch_addresses(client: AsyncClient):
+    """Test account view should batch addresses."""
+    user = await UserFactory.create()
+    token = await create_access_token(user=user)
+
+    addresses = await AddressFactory.create_batch(
+        2, parent_id=user.id, discriminator="user"
+    )
+
+    data = {
+        "update": [{"id": addresses[0].id, "is_default": True}],
+        "delete": [addresses[1].id],
+    }
+
+    response = await client.put(
+        api_router.url_path_for("batch_account_addresses"),
+        json=data,
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"] == [
+        {
+            **response.json()["items"][0],
+            "id": addresses[0].id,
+            "is_default": True,
+        }
+    ]
+
+    response = await client.put(
+        api_router.url_path_for("batch_account_addresses"),
+        json={"delete": [addresses[0].id, addresses[0].id]},
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["body", "delete", 1]
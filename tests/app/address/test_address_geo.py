@@ -0,0 +1,34 @@
+import pytest
+
+from app.address.geo import (
+    encode_geohash,
+    get_bounding_boxes,
+    get_cell_upper_bound,
+    get_covering_cells,
+)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "cell, upper_bound",
+    [("6gy", "6gz"), ("6gz", "6h"), ("zz", None), ("", None)],
+)
+async def test_address_geo_should_get_cell_upper_bound(cell, upper_bound):
+    """Test address geo should get cell upper bound."""
+    assert get_cell_upper_bound(cell) == upper_bound
+
+
+@pytest.mark.asyncio
+async def test_address_geo_should_wrap_across_antimeridian():
+    """Test address geo should wrap across antimeridian."""
+    boxes = get_bounding_boxes(-17.0, 179.99, 5)
+
+    assert [(box[1], box[3]) for box in boxes] == [
+        (pytest.approx(179.943, abs=0.001), 180.0),
+        (-180.0, pytest.approx(-179.963, abs=0.001)),
+    ]
+
+    cells = get_covering_cells(-17.0, 179.99, 5)
+    geohash = encode_geohash(-17.0, -179.98)
+
+    assert any(geohash.startswith(cell) for cell in cells)
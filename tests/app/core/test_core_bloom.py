@@ -0,0 +1,18 @@
+from app.core.bloom import BloomFilter
+
+
+def test_core_bloom_should_contain_added_items():
+    """Test core bloom should contain added items."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+
+    for i in range(1000):
+        bloom.add("item-{}".format(i))
+
+    false_positives = sum(
+        "other-{}".format(i) in bloom for i in range(10000)
+    )
+
+    assert len(bloom) == 1000
+    assert all("item-{}".format(i) in bloom for i in range(1000))
+    assert 0.005 < bloom.false_positive_rate() < 0.015
+    assert false_positives / 10000 < 0.02
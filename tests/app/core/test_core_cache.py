@@ -0,0 +1,50 @@
+import pytest
+
+from app.core.cache import LRUCache
+
+
+@pytest.mark.asyncio
+async def test_core_cache_should_expire_entries(monkeypatch):
+    """Test core cache should expire entries."""
+    now = 100.0
+    monkeypatch.setattr("app.core.cache.monotonic", lambda: now)
+
+    cache = LRUCache(maxsize=2, ttl=10)
+    cache.set("foo", 1)
+
+    assert cache.get("foo") == 1
+
+    now = 110.0
+
+    assert cache.get("foo") is None
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_core_cache_should_evict_entries():
+    """Test core cache should evict entries."""
+    cache = LRUCache()
+    cache.set(("foo", 1), 1)
+    cache.set(("foo", 2), 2)
+    cache.set(("bar", 1), 3)
+
+    assert cache.evict(lambda key: key[0] == "foo") == 2
+    assert cache.get(("bar", 1)) == 3
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_core_cache_should_expire_entries_by_their_ttl(monkeypatch):
+    """Test core cache should expire entries by their ttl."""
+    now = 100.0
+    monkeypatch.setattr("app.core.cache.monotonic", lambda: now)
+
+    cache = LRUCache(ttl=10)
+    cache.set("foo", 1, ttl=5)
+    cache.set("bar", 2)
+
+    now = 105.0
+
+    assert cache.get("foo") is None
+    assert cache.get("bar") == 2
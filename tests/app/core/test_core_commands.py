@@ -1,7 +1,15 @@
+import asyncio
+from datetime import datetime, timedelta
+from io import BytesIO
+from uuid import uuid4
+
 import pytest
 from typer.testing import CliRunner
 
+from app.auth.revocation import revoke_access_token
 from app.cli import cli
+from app.core.metrics import FILTER_FIELD_USAGE, get_metrics
+from app.database import async_session
 
 runner = CliRunner()
 
@@ -12,3 +20,85 @@ async def test_core_cli_should_show_routes():
 
     result = runner.invoke(cli, ["route", "show"])
     assert result.exit_code == 0
+
+
+def test_core_cli_should_show_filter_indexes(app, monkeypatch):
+    """Test core cli should show filter indexes."""
+    # The metrics of the running instance are the ones of this process.
+    monkeypatch.setattr(
+        "app.core.commands.urlopen", lambda url: BytesIO(get_metrics()[0])
+    )
+
+    FILTER_FIELD_USAGE.labels("store_stores", "image").inc()
+    FILTER_FIELD_USAGE.labels("address_addresses", "discriminator").inc()
+    FILTER_FIELD_USAGE.labels("address_addresses", "parent_id").inc()
+
+    result = runner.invoke(
+        cli,
+        [
+            "index",
+            "filters",
+            "--url",
+            "http://localhost:8000/metrics",
+            "--limit",
+            "100",
+        ],
+    )
+    lines = result.stdout.splitlines()
+
+    assert result.exit_code == 0
+    assert any(
+        line.split()[:2] == ["store_stores", "image"] and line.endswith("-")
+        for line in lines
+    )
+    assert any(
+        line.split()[:2] == ["address_addresses", "discriminator"]
+        and line.endswith("ix_address_addresses_discriminator_parent_id")
+        for line in lines
+    )
+    assert any(
+        line.split()[:2] == ["address_addresses", "parent_id"]
+        and line.endswith("(column 2)")
+        for line in lines
+    )
+
+
+@pytest.mark.parametrize("url", [None, "file:///etc/passwd"])
+def test_core_cli_should_not_show_filter_indexes_without_metrics(
+    app, monkeypatch, url
+):
+    """Test core cli should not show filter indexes without metrics."""
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+    args = ["index", "filters"]
+    if url is not None:
+        args += ["--url", url]
+
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 2
+    assert "--url" in result.output
+
+
+def test_core_cli_should_rebuild_revocation_filter(app):
+    """Test core cli should rebuild revocation filter."""
+
+    async def revoke_tokens():
+        async with async_session() as session:
+            for expire_at in [timedelta(hours=1), timedelta(hours=-1)]:
+                await revoke_access_token(
+                    session=session,
+                    jti=uuid4().hex,
+                    expire_at=datetime.utcnow() + expire_at,
+                )
+
+    asyncio.run(revoke_tokens())
+
+    result = runner.invoke(
+        cli, ["revocation", "rebuild", "--probes", "1000"]
+    )
+    lines = result.stdout.splitlines()
+
+    assert result.exit_code == 0
+    assert any(line.split() == ["Revoked", "tokens", "1"] for line in lines)
+    assert any(line.startswith("Measured false positive") for line in lines)
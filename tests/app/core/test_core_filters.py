@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy.future import select
+
+from app.core.filters.filters import (
+    FILTER_PLANS,
+    add_filter_trace_hook,
+    apply_filters,
+    remove_filter_trace_hook,
+)
+from app.core.filters.sorting import SORT_PLANS, apply_sort
+from app.store.models import Store
+
+
+@pytest.mark.asyncio
+async def test_core_filters_should_reuse_filter_plan():
+    """Test core filters should reuse filter plan."""
+    FILTER_PLANS.clear()
+
+    filter_spec = {
+        "or": [
+            {"field": "title", "op": "eq", "value": "foo"},
+            {"field": "legal", "op": "ilike", "value": "%foo%"},
+        ]
+    }
+    stmt = apply_filters(select(Store), filter_spec)
+
+    filter_spec["or"][0]["value"] = "bar"
+    filter_spec["or"][1]["value"] = "%bar%"
+    other_stmt = apply_filters(select(Store), filter_spec)
+
+    assert FILTER_PLANS.info()["hits"] == 1
+    assert FILTER_PLANS.info()["size"] == 1
+    assert sorted(stmt.compile().params.values()) == ["%foo%", "foo"]
+    assert sorted(other_stmt.compile().params.values()) == ["%bar%", "bar"]
+
+
+@pytest.mark.asyncio
+async def test_core_filters_should_reuse_sort_plan():
+    """Test core filters should reuse sort plan."""
+    SORT_PLANS.clear()
+
+    sort_spec = [{"field": "title", "direction": "desc"}]
+    stmt = apply_sort(select(Store), sort_spec)
+    other_stmt = apply_sort(select(Store), sort_spec)
+
+    assert SORT_PLANS.info()["hits"] == 1
+    assert str(stmt) == str(other_stmt)
+
+
+@pytest.mark.asyncio
+async def test_core_filters_should_trace_filters():
+    """Test core filters should trace filters."""
+    traces = []
+    add_filter_trace_hook(traces.append)
+
+    try:
+        apply_filters(
+            select(Store), [{"field": "title", "op": "eq", "value": "foo"}]
+        )
+    finally:
+        remove_filter_trace_hook(traces.append)
+
+    apply_filters(
+        select(Store), [{"field": "title", "op": "eq", "value": "bar"}]
+    )
+
+    assert len(traces) == 1
+    assert traces[0].where == "store_stores.title = :title_1"
+    assert traces[0].params == {"title_1": "foo"}
+    assert traces[0].compile_time > 0
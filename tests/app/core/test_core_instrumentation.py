@@ -0,0 +1,75 @@
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.instrumentation import (
+    QueryStatsMiddleware,
+    get_query_stats,
+    setup_query_stats,
+)
+from app.core.metrics import child_exit, setup_db_metrics
+from app.database import engine
+from app.depends import get_session
+
+
+@pytest.mark.asyncio
+async def test_core_instrumentation_should_collect_query_stats(app):
+    """Test core instrumentation should collect query stats."""
+    setup_query_stats(engine)
+
+    instrumented = FastAPI()
+    instrumented.add_middleware(QueryStatsMiddleware)
+
+    @instrumented.get("/")
+    async def index(session: AsyncSession = Depends(get_session)):
+        await session.execute(text("SELECT 1"))
+        await session.execute(text("SELECT 2"))
+        await session.commit()
+
+        return get_query_stats().dict()
+
+    async with AsyncClient(app=instrumented, base_url="http://test") as c:
+        response = await c.get("/")
+
+    assert response.json()["statements"] == 2
+    assert response.json()["commits"] == 1
+    assert response.json()["slowest_statement"] in ["SELECT 1", "SELECT 2"]
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert get_query_stats() is None
+
+
+@pytest.mark.asyncio
+async def test_core_instrumentation_should_measure_pool():
+    """Test core instrumentation should measure pool."""
+    pool_engine = create_async_engine("sqlite+aiosqlite://")
+    setup_db_metrics(pool_engine, "testing")
+
+    def get_sample(name):
+        return REGISTRY.get_sample_value(name, {"engine": "testing"})
+
+    async with pool_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+        assert get_sample("db_pool_checked_out") == 1
+
+    await pool_engine.dispose()
+
+    assert get_sample("db_pool_checkout_seconds_count") == 1
+    assert get_sample("db_pool_checked_out") == 0
+
+
+@pytest.mark.asyncio
+async def test_core_instrumentation_should_mark_dead_workers(monkeypatch):
+    """Test core instrumentation should mark dead workers."""
+    pids = []
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", "/tmp")
+    monkeypatch.setattr(
+        "app.core.metrics.multiprocess.mark_process_dead", pids.append
+    )
+
+    child_exit(None, type("Worker", (), {"pid": 42}))
+
+    assert pids == [42]
@@ -0,0 +1,78 @@
+import json
+
+import orjson
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import ValidationError
+
+from app.core.responses import SchemaJSONResponse
+from app.core.services import search_filter_sort_paginate
+from app.database import async_session
+from app.store.models import Store
+from app.store.schemas import StorePagination
+from tests.app.address.factories import AddressFactory
+from tests.app.store.factories import StoreFactory
+
+
+def validate_and_encode(schema, content):
+    return json.loads(json.dumps(jsonable_encoder(schema(**content))))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include", [[], ["addresses"]])
+async def test_core_responses_should_render_as_schema(app, include):
+    """Test core responses should render as schema."""
+    stores = await StoreFactory.create_batch(
+        2, phones=[{"name": "Main", "number": "5511999999999", "default": 1}]
+    )
+    await AddressFactory.create(
+        parent_id=stores[0].id, discriminator="store", state="MG"
+    )
+
+    async with async_session() as session:
+        pagination = await search_filter_sort_paginate(
+            session=session, model=Store, include=include
+        )
+
+        response = SchemaJSONResponse(pagination, schema=StorePagination)
+
+        assert orjson.loads(response.body) == validate_and_encode(
+            StorePagination, pagination
+        )
+
+    items = orjson.loads(response.body)["items"]
+    assert items[0]["phones"][0]["number"] == 5511999999999
+    assert items[0]["phones"][0]["default"] is True
+    if include:
+        assert items[0]["addresses"]
+    else:
+        assert items[0]["addresses"] is None
+
+
+@pytest.mark.asyncio
+async def test_core_responses_should_render_without_schema(app):
+    """Test core responses should render without schema."""
+    stores = await StoreFactory.create_batch(2)
+
+    async with async_session() as session:
+        pagination = await search_filter_sort_paginate(
+            session=session, model=Store, fields=["id", "title"]
+        )
+
+    response = SchemaJSONResponse(pagination)
+
+    assert response.media_type == "application/json"
+    assert orjson.loads(response.body)["items"] == [
+        {"id": store.id, "title": store.title} for store in stores
+    ]
+
+
+@pytest.mark.asyncio
+async def test_core_responses_not_should_render_invalid_values():
+    """Test core responses not should render invalid values."""
+    pagination = {"items": [{"id": "invalid", "title": "Store"}]}
+
+    with pytest.raises(ValidationError) as error:
+        SchemaJSONResponse(pagination, schema=StorePagination)
+
+    assert error.value.errors()[0]["loc"] == ("id",)
@@ -0,0 +1,175 @@
+import pytest
+from sqlalchemy.future import select
+
+from app.core.filters.exceptions import InvalidPage
+from app.core.services import (
+    search_filter_sort_paginate,
+    search_filter_sort_stream,
+)
+from app.database import async_session
+from app.store.models import Store
+from tests.app.store.factories import SegmentFactory, StoreFactory
+
+
+@pytest.mark.asyncio
+async def test_core_services_should_paginate_base_statement(app):
+    """Test core services should paginate base statement."""
+    segment = await SegmentFactory.create()
+    stores = await StoreFactory.create_batch(3, segment=segment)
+    await StoreFactory.create_batch(2)
+
+    async with async_session() as session:
+        pagination = await search_filter_sort_paginate(
+            session=session,
+            model=Store,
+            stmt=select(Store).where(Store.segment_id == segment.id),
+            filter_spec=[{"field": "id", "op": "ne", "value": stores[0].id}],
+            sort_spec=[{"field": "id", "direction": "desc"}],
+        )
+
+    assert pagination["total"] == 2
+    assert [store.id for store in pagination["items"]] == [
+        stores[2].id,
+        stores[1].id,
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", ["exact", "window"])
+async def test_core_services_should_paginate_projection(app, count):
+    """Test core services should paginate projection."""
+    stores = await StoreFactory.create_batch(3)
+
+    async with async_session() as session:
+        pagination = await search_filter_sort_paginate(
+            session=session,
+            model=Store,
+            stmt=select(Store.id, Store.title),
+            items_per_page=2,
+            count=count,
+        )
+        next_pagination = await search_filter_sort_paginate(
+            session=session,
+            model=Store,
+            stmt=select(Store.id, Store.title),
+            items_per_page=2,
+            cursor=pagination["next_cursor"],
+        )
+
+    assert pagination["total"] == 3
+    assert [item.title for item in pagination["items"]] == [
+        stores[0].title,
+        stores[1].title,
+    ]
+    assert [item.id for item in next_pagination["items"]] == [stores[2].id]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+@pytest.mark.parametrize("nulls", [None, "nullsfirst", "nullslast"])
+async def test_core_services_should_paginate_nullable_sort_key(
+    app, direction, nulls
+):
+    """Test core services should paginate nullable sort key."""
+    stores = [
+        await StoreFactory.create(legal=legal)
+        for legal in ["b", None, "a", None, "c"]
+    ]
+
+    sort_spec = {"field": "legal", "direction": direction}
+    if nulls is not None:
+        sort_spec[nulls] = True
+
+    items, cursor, pages = [], None, 0
+    while True:
+        async with async_session() as session:
+            pagination = await search_filter_sort_paginate(
+                session=session,
+                model=Store,
+                sort_spec=[sort_spec],
+                items_per_page=2,
+                cursor=cursor,
+            )
+
+        items += [store.id for store in pagination["items"]]
+        cursor, pages = pagination["next_cursor"], pages + 1
+        if cursor is None:
+            break
+
+    values = [stores[2].id, stores[0].id, stores[4].id]
+    if direction == "desc":
+        values.reverse()
+
+    # By default the NULLs are sorted after every value.
+    if nulls == "nullsfirst" or (nulls is None and direction == "desc"):
+        expected = [stores[1].id, stores[3].id] + values
+    else:
+        expected = values + [stores[1].id, stores[3].id]
+
+    assert items == expected
+    assert pages == 3
+
+    async with async_session() as session:
+        previous = await search_filter_sort_paginate(
+            session=session,
+            model=Store,
+            sort_spec=[sort_spec],
+            items_per_page=2,
+            cursor=pagination["prev_cursor"],
+        )
+
+    assert [store.id for store in previous["items"]] == expected[2:4]
+
+
+@pytest.mark.asyncio
+async def test_core_services_should_keep_statement_order(app):
+    """Test core services should keep statement order."""
+    stores = [
+        await StoreFactory.create(is_active=is_active, title=title)
+        for is_active, title in [(True, "c"), (False, "a"), (False, "b")]
+    ]
+
+    async with async_session() as session:
+        pagination = await search_filter_sort_paginate(
+            session=session,
+            model=Store,
+            stmt=select(Store).order_by(Store.is_active),
+            sort_spec=[{"field": "title", "direction": "desc"}],
+            items_per_page=2,
+        )
+
+    assert [store.id for store in pagination["items"]] == [
+        stores[2].id,
+        stores[1].id,
+    ]
+    assert pagination["has_next"] is True
+    assert pagination["next_cursor"] is None
+
+    with pytest.raises(InvalidPage):
+        async with async_session() as session:
+            await search_filter_sort_paginate(
+                session=session,
+                model=Store,
+                stmt=select(Store).order_by(Store.is_active),
+                cursor="cursor",
+            )
+
+
+@pytest.mark.asyncio
+async def test_core_services_should_stream_in_chunks(app):
+    """Test core services should stream in chunks."""
+    stores = await StoreFactory.create_batch(5)
+
+    async with async_session() as session:
+        chunks = await search_filter_sort_stream(
+            session=session,
+            model=Store,
+            filter_spec=[{"field": "id", "op": "ne", "value": stores[0].id}],
+            chunk_size=2,
+        )
+        items = [[store.id for store in chunk] async for chunk in chunks]
+
+    assert items == [
+        [stores[1].id, stores[2].id],
+        [stores[3].id, stores[4].id],
+    ]
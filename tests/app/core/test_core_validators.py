@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.validators import get_unique_violation_fields
+
+
+class DriverError(Exception):
+    def __init__(self, message, detail=None):
+        super().__init__(message)
+        self.detail = detail
+
+
+@pytest.mark.parametrize(
+    "orig, fields",
+    [
+        (
+            DriverError("UNIQUE constraint failed: store_stores.title"),
+            ["title"],
+        ),
+        (
+            DriverError(
+                "UNIQUE constraint failed: "
+                "address_addresses.parent_id, address_addresses.name"
+            ),
+            ["parent_id", "name"],
+        ),
+        (
+            DriverError(
+                'duplicate key value violates unique constraint "x"',
+                detail="Key (email)=(foo@bar.com) already exists.",
+            ),
+            ["email"],
+        ),
+        (DriverError("NOT NULL constraint failed: store_stores.title"), []),
+    ],
+)
+def test_core_validators_should_get_unique_violation_fields(orig, fields):
+    """Test core validators should get unique violation fields."""
+    error = IntegrityError("INSERT ...", {}, orig)
+
+    assert get_unique_violation_fields(error) == fields
@@ -26,3 +26,16 @@ async def test_core_view_should_root(client: AsyncClient):
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["application"] == get_settings().APP_NAME
     assert response.json()["version"] == __version__
+
+
+@pytest.mark.asyncio
+async def test_core_view_should_metrics(client: AsyncClient):
+    await client.get(api_router.url_path_for("health_check"))
+    response = await client.get(api_router.url_path_for("metrics"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/health-check",status="200"}'
+    ) in response.text
+    assert 'db_pool_checkout_seconds_count{engine="primary"}' in response.text
@@ -1,9 +1,20 @@
 import pytest
+from jose import JWTError
+from pydantic import ValidationError
 
 from app.account.schemas import AccountCreate
 from app.account.services.account import create
-from app.auth.services import authenticate_user
+from app.auth import services
+from app.auth.depends import TOKEN_CLAIMS, get_token_claims
+from app.auth.services import authenticate_user, create_access_token
+from app.config import Settings
 from app.database import async_session
+from app.user.hashers import (
+    CryptHasher,
+    check_password,
+    hash_password,
+    verify_password,
+)
 from tests.app.user.factories import UserFactory
 
 
@@ -38,3 +49,83 @@ async def test_oauth_service_not_should_authenticate_user(
         password="invalid",
     )
     assert user is False
+
+
+@pytest.mark.asyncio
+async def test_oauth_service_should_rehash_legacy_password(app):
+    """Test oauth service should rehash legacy password."""
+    user = await UserFactory.create()
+    legacy_hash = CryptHasher().hash("legacypass")
+
+    async with async_session() as session:
+        user = await session.merge(user)
+        user.set_password_hash(legacy_hash, legacy_hash.rsplit("$", 1)[0])
+        await session.commit()
+
+        account = await authenticate_user(
+            session=session, username=user.email, password="legacypass"
+        )
+        await session.refresh(account)
+
+    assert account.password.startswith("scrypt$")
+    assert account.check_password("legacypass")
+    assert not account.check_password("testpass")
+
+
+@pytest.mark.asyncio
+async def test_oauth_service_should_hash_in_pool():
+    """Test oauth service should hash in pool."""
+    encoded, salt = await hash_password("testpass")
+
+    assert salt in encoded
+    assert await verify_password("testpass", encoded) == (True, None)
+    assert await verify_password("invalid", encoded) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_oauth_service_should_cache_token_claims(app, monkeypatch):
+    """Test oauth service should cache token claims."""
+    user = await UserFactory.create()
+    token = await create_access_token(user=user)
+    decoded = []
+
+    def decode_access_token(token):
+        decoded.append(token)
+        return services.decode_access_token(token)
+
+    monkeypatch.setattr(
+        "app.auth.depends.decode_access_token", decode_access_token
+    )
+
+    claims = get_token_claims(token["access_token"])
+    claims["sub"] = "changed@example.com"
+
+    assert get_token_claims(token["access_token"])["sub"] == user.email
+    assert len(decoded) == 1
+    assert TOKEN_CLAIMS.info()["hits"] == 1
+
+    with pytest.raises(JWTError):
+        get_token_claims(token["access_token"] + "invalid")
+
+    assert len(TOKEN_CLAIMS) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("encoded", ["$6$salt$hash", "plain", "scrypt$1"])
+async def test_oauth_service_not_should_verify_unknown_hash(encoded):
+    """Test oauth service not should verify unknown hash."""
+    assert check_password("testpass", encoded) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_oauth_service_not_should_hash_with_missing_crypt(
+    monkeypatch,
+):
+    """Test oauth service not should hash with missing crypt."""
+    monkeypatch.setattr("app.config.find_spec", lambda name: None)
+
+    with pytest.raises(ValidationError):
+        Settings(
+            SQLALCHEMY_DATABASE_URI="sqlite+aiosqlite://",
+            PASSWORD_HASHER="crypt",
+        )
@@ -2,6 +2,7 @@ import pytest
 from fastapi import status
 from httpx import AsyncClient
 
+from app.auth.services import create_access_token
 from app.main import api_router
 from tests.app.user.factories import UserFactory
 
@@ -45,3 +46,118 @@ async def test_oauth_view_not_should_create_token(client: AsyncClient):
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     assert response.json() == {"detail": "Incorrect username or password"}
+
+
+@pytest.mark.asyncio
+async def test_oauth_view_should_refresh_token(client: AsyncClient):
+    """Test oauth view should refresh token."""
+    user = await UserFactory.create(password="testpass")
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={
+            "username": user.email,
+            "password": "testpass",
+            "grant_type": "password",
+        },
+    )
+    refresh_token = response.json()["refresh_token"]
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={"refresh_token": refresh_token, "grant_type": "refresh_token"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["access_token"] is not None
+    assert response.json()["refresh_token"] not in [None, refresh_token]
+
+    rotated_token = response.json()["refresh_token"]
+
+    # The first token was rotated, using it again revokes the new one.
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={"refresh_token": refresh_token, "grant_type": "refresh_token"},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json() == {"detail": "Invalid refresh token"}
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={"refresh_token": rotated_token, "grant_type": "refresh_token"},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_oauth_view_should_revoke_token(client: AsyncClient):
+    """Test oauth view should revoke token."""
+    user = await UserFactory.create(password="testpass")
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={"username": user.email, "password": "testpass"},
+    )
+    refresh_token = response.json()["refresh_token"]
+
+    response = await client.post(
+        api_router.url_path_for("revoke_token"),
+        data={"token": refresh_token},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={"refresh_token": refresh_token, "grant_type": "refresh_token"},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_oauth_view_should_logout(client: AsyncClient):
+    """Test oauth view should logout."""
+    user = await UserFactory.create(password="testpass")
+    other_token = await create_access_token(user=user)
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={"username": user.email, "password": "testpass"},
+    )
+    token = response.json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    response = await client.post(
+        api_router.url_path_for("logout"),
+        data={"refresh_token": token["refresh_token"]},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = await client.get(
+        api_router.url_path_for("get_account"), headers=headers
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.post(
+        api_router.url_path_for("create_token"),
+        data={
+            "refresh_token": token["refresh_token"],
+            "grant_type": "refresh_token",
+        },
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    # Only the token of the logout is revoked.
+    response = await client.get(
+        api_router.url_path_for("get_account"),
+        headers={"Authorization": f"Bearer {other_token['access_token']}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
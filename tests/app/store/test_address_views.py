@@ -5,6 +5,7 @@ import pytest
 from fastapi import status
 from httpx import AsyncClient
 
+from app.address.geo import encode_geohash
 from app.auth.services import create_access_token
 from app.database import async_session
 from app.main import api_router
@@ -53,7 +54,9 @@ async def test_store_view_should_create_address(
         assert response.status_code == status.HTTP_201_CREATED
 
         async with async_session() as session:
-            store = await get(session=session, store_id=store.id)
+            store = await get(
+                session=session, store_id=store.id, include=["addresses"]
+            )
             assert store.addresses[0].postcode == data["postcode"]
     else:
         assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -323,3 +326,81 @@ async def test_store_view_should_admin_delete_address(
         assert response.status_code == status.HTTP_204_NO_CONTENT
     else:
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_batch_addresses(client: AsyncClient):
+    """Test store view should batch addresses."""
+    user = await UserFactory.create()
+    token = await create_access_token(user=user)
+
+    store = await StoreFactory.create(
+        people=[StorePerson(is_owner=True, user=user)]
+    )
+    addresses = await AddressFactory.create_batch(
+        3, parent_id=store.id, discriminator="store", lat=10.0, lng=20.0
+    )
+    other = await AddressFactory.create(
+        parent_id=store.id + 1, discriminator="store"
+    )
+
+    build = await AddressFactory.build(lat=-18.9186, lng=-48.2772)
+    data = {
+        "create": [
+            {
+                "name": build.name,
+                "street": build.street,
+                "neighborhood": build.neighborhood,
+                "city": build.city,
+                "postcode": build.postcode,
+                "state": build.state,
+                "lat": build.lat,
+                "lng": build.lng,
+            }
+        ],
+        "update": [
+            {"id": addresses[0].id, "city": "Uberlandia"},
+            {"id": addresses[1].id, "lat": -18.9186},
+        ],
+        "delete": [addresses[2].id],
+    }
+
+    response = await client.put(
+        api_router.url_path_for("batch_store_addresses", store_id=store.id),
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+        json=data,
+    )
+
+    result = response.json()
+    items = {item["id"]: item for item in result["items"]}
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["created"], result["updated"], result["deleted"]] == [
+        1,
+        2,
+        1,
+    ]
+    assert len(items) == 3
+    assert addresses[2].id not in items
+    assert items[addresses[0].id]["city"] == "Uberlandia"
+    assert items[addresses[1].id]["lat"] == -18.9186
+
+    async with async_session() as session:
+        store = await get(
+            session=session, store_id=store.id, include=["addresses"]
+        )
+
+    geohashes = {address.id: address.geohash for address in store.addresses}
+    assert geohashes[addresses[0].id] == encode_geohash(10.0, 20.0)
+    assert geohashes[addresses[1].id] == encode_geohash(-18.9186, 20.0)
+    assert encode_geohash(build.lat, build.lng) in geohashes.values()
+
+    data = {"update": [{"id": other.id, "city": "Uberaba"}], "delete": []}
+    response = await client.put(
+        api_router.url_path_for("batch_store_addresses", store_id=store.id),
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+        json=data,
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["body", "update", 0, "id"]
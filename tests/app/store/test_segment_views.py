@@ -6,6 +6,7 @@ from fastapi import status
 from httpx import AsyncClient
 
 from app.auth.services import create_access_token
+from app.config import get_settings
 from app.main import api_router
 from tests.app.store.factories import SegmentFactory
 from tests.app.user.factories import UserFactory
@@ -44,10 +45,15 @@ async def test_store_view_should_create_segment(
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize("unique_validation", ["query", "constraint"])
 async def test_store_view_not_should_create_duplicate_segment(
-    client: AsyncClient,
+    client: AsyncClient, monkeypatch, unique_validation
 ):
     """Test store view not should create duplicate segment."""
+    monkeypatch.setattr(
+        get_settings(), "UNIQUE_VALIDATION", unique_validation
+    )
+
     user = await UserFactory.create(is_admin=True)
     token = await create_access_token(user=user)
 
@@ -66,6 +72,13 @@ async def test_store_view_not_should_create_duplicate_segment(
     )
 
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"] == [
+        {
+            "loc": ["body", "title"],
+            "msg": "already exists",
+            "type": "value_error.unique",
+        }
+    ]
 
 
 @pytest.mark.asyncio
@@ -94,6 +107,31 @@ async def test_store_view_should_get_segments(client: AsyncClient):
     assert response.json()["total"] == len(segments)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", ["exact", "estimate", "none", "window"])
+async def test_store_view_should_get_segments_by_count_mode(
+    client: AsyncClient, count
+):
+    """Test store view should get segments by count mode."""
+    segments = await SegmentFactory.create_batch(3)
+
+    response = await client.get(
+        api_router.url_path_for("get_segments"),
+        params={"itemsPerPage": 2, "count": count},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["count"] == count
+    assert response.json()["has_next"] is True
+    assert len(response.json()["items"]) == 2
+
+    if count == "none":
+        assert response.json()["total"] is None
+        assert response.json()["num_pages"] is None
+    else:
+        assert response.json()["total"] == len(segments)
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("email_verified_at", [None, datetime.now()])
 async def test_store_view_should_get_segment(
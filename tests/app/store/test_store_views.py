@@ -1,3 +1,4 @@
+import csv
 import json
 from datetime import datetime
 
@@ -5,7 +6,9 @@ import pytest
 from fastapi import status
 from httpx import AsyncClient
 
+from app.address.geo import encode_geohash
 from app.auth.services import create_access_token
+from app.config import get_settings
 from app.database import async_session
 from app.main import api_router
 from app.store.models import StorePerson
@@ -112,6 +115,148 @@ async def test_store_view_should_create_store_with_addresses(
     assert response.status_code == status.HTTP_201_CREATED
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [None, 2])
+async def test_store_view_should_create_stores_bulk(
+    client: AsyncClient, chunk_size
+):
+    """Test store view should create stores bulk."""
+    segment = await SegmentFactory.create()
+    existing = await StoreFactory.create()
+    address = await AddressFactory.build(lat=-18.9186, lng=-48.2772)
+    user = await UserFactory.create()
+    token = await create_access_token(user=user)
+
+    data = []
+    for _ in range(5):
+        build = await StoreFactory.build()
+        data.append(
+            {
+                "title": build.title,
+                "legal": build.legal,
+                "phones": build.phones,
+                "document_type": build.document_type,
+                "document_number": build.document_number,
+                "segment_id": segment.id,
+            }
+        )
+    data[1]["title"] = existing.title
+    data[3]["document_number"] = data[0]["document_number"]
+    data[4]["addresses"] = [
+        {
+            "name": address.name,
+            "street": address.street,
+            "neighborhood": address.neighborhood,
+            "city": address.city,
+            "postcode": address.postcode,
+            "state": address.state,
+            "lat": address.lat,
+            "lng": address.lng,
+        }
+    ]
+
+    params = {"chunkSize": chunk_size} if chunk_size else {}
+    response = await client.post(
+        api_router.url_path_for("create_stores_bulk"),
+        json=data,
+        params=params,
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+    )
+
+    result = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert result["created"] == 3
+    assert result["failed"] == 2
+    assert [item["id"] is not None for item in result["items"]] == [
+        True,
+        False,
+        True,
+        False,
+        True,
+    ]
+    assert result["items"][1]["detail"][0]["loc"] == ["body", "title"]
+    assert result["items"][3]["detail"][0]["loc"] == [
+        "body",
+        "document_number",
+    ]
+
+    async with async_session() as session:
+        store = await get(
+            session=session,
+            store_id=result["items"][4]["id"],
+            include=["addresses"],
+        )
+
+        query = await session.execute(store.people.where(StorePerson.is_owner))
+        person = query.scalar_one()
+        await session.commit()
+
+    assert store.title == data[4]["title"]
+    assert person.user_id == user.id
+    assert store.addresses[0].discriminator == "store"
+    assert store.addresses[0].geohash == encode_geohash(
+        address.lat, address.lng
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [None, 1])
+async def test_store_view_should_report_bulk_chunk_conflicts(
+    client: AsyncClient, monkeypatch, chunk_size
+):
+    """Test store view should report bulk chunk conflicts."""
+    segment = await SegmentFactory.create()
+    existing = await StoreFactory.create()
+    user = await UserFactory.create()
+    token = await create_access_token(user=user)
+
+    # The conflicts are not found beforehand, as if the existing store was
+    # created concurrently.
+    async def get_store_conflicts(*, session, stores_in):
+        return [[] for _ in stores_in]
+
+    monkeypatch.setattr(
+        "app.store.services.store.get_store_conflicts", get_store_conflicts
+    )
+
+    data = []
+    for _ in range(2):
+        build = await StoreFactory.build()
+        data.append(
+            {
+                "title": build.title,
+                "legal": build.legal,
+                "phones": build.phones,
+                "document_type": build.document_type,
+                "document_number": build.document_number,
+                "segment_id": segment.id,
+            }
+        )
+    data[1]["title"] = existing.title
+
+    params = {"chunkSize": chunk_size} if chunk_size else {}
+    response = await client.post(
+        api_router.url_path_for("create_stores_bulk"),
+        json=data,
+        params=params,
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+    )
+
+    result = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert result["created"] == 1
+    assert result["items"][0]["detail"] is None
+    assert result["items"][1]["id"] is None
+    assert result["items"][1]["detail"][0]["loc"] == ["body", "title"]
+
+    async with async_session() as session:
+        store = await get(session=session, store_id=result["items"][0]["id"])
+
+    assert store.title == data[0]["title"]
+
+
 @pytest.mark.asyncio
 async def test_store_view_not_should_create_duplicate_store(
     client: AsyncClient,
@@ -170,6 +315,270 @@ async def test_store_view_should_get_stores(client: AsyncClient):
     assert response.json()["total"] == len(stores)
 
 
+@pytest.mark.asyncio
+async def test_store_view_should_get_stores_by_cursor(client: AsyncClient):
+    """Test store view should get stores by cursor."""
+    stores = await StoreFactory.create_batch(5)
+
+    sort_spec = [{"model": "Store", "field": "title", "direction": "desc"}]
+    params = {"sort": json.dumps(sort_spec), "itemsPerPage": 2}
+
+    response = await client.get(
+        api_router.url_path_for("get_stores"), params=params
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["prev_cursor"] is None
+
+    pages = [response.json()]
+    while pages[-1]["next_cursor"] is not None:
+        response = await client.get(
+            api_router.url_path_for("get_stores"),
+            params={**params, "cursor": pages[-1]["next_cursor"]},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.json())
+
+    titles = [item["title"] for page in pages for item in page["items"]]
+    assert titles == sorted([store.title for store in stores], reverse=True)
+
+    response = await client.get(
+        api_router.url_path_for("get_stores"),
+        params={**params, "cursor": pages[-1]["prev_cursor"]},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"] == pages[-2]["items"]
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_reject_malformed_cursor(client: AsyncClient):
+    """Test store view should reject malformed cursor."""
+    response = await client.get(
+        api_router.url_path_for("get_stores"), params={"cursor": "garbage!!"}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["query", "cursor"]
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_reject_cursor_of_other_sort(
+    client: AsyncClient,
+):
+    """Test store view should reject cursor of other sort."""
+    await StoreFactory.create_batch(3)
+
+    sort_spec = [{"field": "title", "direction": "desc"}]
+    response = await client.get(
+        api_router.url_path_for("get_stores"),
+        params={"sort": json.dumps(sort_spec), "itemsPerPage": 1},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    sort_spec = [{"field": "title", "direction": "asc"}]
+    response = await client.get(
+        api_router.url_path_for("get_stores"),
+        params={
+            "sort": json.dumps(sort_spec),
+            "itemsPerPage": 1,
+            "cursor": response.json()["next_cursor"],
+        },
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["query", "cursor"]
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_get_stores_fields(client: AsyncClient):
+    """Test store view should get stores fields."""
+    stores = sorted(
+        await StoreFactory.create_batch(3),
+        key=lambda store: store.title,
+        reverse=True,
+    )
+
+    sort_spec = [{"field": "title", "direction": "desc"}]
+    params = {
+        "fields": "image,legal",
+        "sort": json.dumps(sort_spec),
+        "itemsPerPage": 2,
+    }
+
+    response = await client.get(
+        api_router.url_path_for("get_stores"), params=params
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["items"][0] == {
+        "id": stores[0].id,
+        "image": stores[0].image,
+        "legal": stores[0].legal,
+    }
+
+    response = await client.get(
+        api_router.url_path_for("get_stores"),
+        params={**params, "cursor": response.json()["next_cursor"]},
+    )
+
+    assert [item["id"] for item in response.json()["items"]] == [stores[2].id]
+
+    response = await client.get(
+        api_router.url_path_for("get_stores"),
+        params={"fields": "title,external_data"},
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.json()["detail"][0]["loc"] == ["query", "fields"]
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_export_stores_ndjson(client: AsyncClient):
+    """Test store view should export stores ndjson."""
+    segment = await SegmentFactory.create()
+    stores = await StoreFactory.create_batch(3, segment=segment)
+    await StoreFactory.create_batch(2)
+
+    filter_spec = [{"field": "segment_id", "op": "eq", "value": segment.id}]
+    sort_spec = [{"field": "id", "direction": "desc"}]
+
+    response = await client.get(
+        api_router.url_path_for("export_stores"),
+        params={
+            "filter": json.dumps(filter_spec),
+            "sort": json.dumps(sort_spec),
+        },
+    )
+
+    items = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [item["id"] for item in items] == [
+        store.id for store in reversed(stores)
+    ]
+    assert items[0]["title"] == stores[2].title
+    assert items[0]["phones"][0]["number"] == int(
+        stores[2].phones[0]["number"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_export_stores_csv(client: AsyncClient):
+    """Test store view should export stores csv."""
+    stores = await StoreFactory.create_batch(3)
+
+    response = await client.get(
+        api_router.url_path_for("export_stores"),
+        params={"format": "csv", "fields": "title,legal"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="stores.csv"' in response.headers["content-disposition"]
+    assert list(csv.reader(response.text.splitlines())) == [
+        ["id", "title", "legal"],
+        *[[str(store.id), store.title, store.legal] for store in stores],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_get_stores_nearby(client: AsyncClient):
+    """Test store view should get stores nearby."""
+    lat, lng = -19.9167, -43.9345
+
+    far_store = await StoreFactory.create(
+        addresses=[await AddressFactory.build(lat=lat + 0.2, lng=lng)]
+    )
+    near_store = await StoreFactory.create(
+        addresses=[
+            await AddressFactory.build(lat=lat + 0.2, lng=lng),
+            await AddressFactory.build(lat=lat + 0.01, lng=lng),
+        ]
+    )
+    nearest_store = await StoreFactory.create(
+        addresses=[await AddressFactory.build(lat=lat, lng=lng + 0.005)]
+    )
+
+    response = await client.get(
+        api_router.url_path_for("get_stores_nearby"),
+        params={"lat": lat, "lng": lng, "radius_km": 5},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 2
+    assert [item["id"] for item in response.json()["items"]] == [
+        nearest_store.id,
+        near_store.id,
+    ]
+    assert response.json()["items"][1]["distance_km"] == pytest.approx(
+        1.112, abs=0.01
+    )
+
+    response = await client.get(
+        api_router.url_path_for("get_stores_nearby"),
+        params={"lat": lat, "lng": lng, "radius_km": 50, "itemsPerPage": 2},
+    )
+
+    assert response.json()["total"] == 3
+    assert response.json()["has_next"] is True
+    assert response.json()["items"][-1]["id"] == near_store.id
+
+    response = await client.get(
+        api_router.url_path_for("get_stores_nearby"),
+        params={
+            "lat": lat,
+            "lng": lng,
+            "radius_km": 50,
+            "page": 2,
+            "itemsPerPage": 2,
+        },
+    )
+
+    assert [item["id"] for item in response.json()["items"]] == [far_store.id]
+    assert response.json()["has_next"] is False
+
+
+@pytest.mark.asyncio
+async def test_store_view_should_get_stores_nearby_antimeridian(
+    client: AsyncClient, monkeypatch
+):
+    """Test store view should get stores nearby antimeridian."""
+    east_store = await StoreFactory.create(
+        addresses=[await AddressFactory.build(lat=-17.0, lng=179.99)]
+    )
+    west_store = await StoreFactory.create(
+        addresses=[await AddressFactory.build(lat=-17.0, lng=-179.98)]
+    )
+    await StoreFactory.create(
+        addresses=[await AddressFactory.build(lat=-17.0, lng=-179.9)]
+    )
+
+    response = await client.get(
+        api_router.url_path_for("get_stores_nearby"),
+        params={"lat": -17.0, "lng": 179.995, "radius_km": 5},
+    )
+
+    assert [item["id"] for item in response.json()["items"]] == [
+        east_store.id,
+        west_store.id,
+    ]
+    assert response.json()["truncated"] is False
+
+    monkeypatch.setattr(get_settings(), "NEARBY_MAX_CANDIDATES", 1)
+
+    response = await client.get(
+        api_router.url_path_for("get_stores_nearby"),
+        params={"lat": -17.0, "lng": 179.995, "radius_km": 5},
+    )
+
+    assert [item["id"] for item in response.json()["items"]] == [east_store.id]
+    assert response.json()["total"] == 1
+    assert response.json()["truncated"] is True
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("email_verified_at", [None, datetime.now()])
 async def test_store_view_should_get_store(
@@ -192,6 +601,34 @@ async def test_store_view_should_get_store(
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include", [[], ["addresses"]])
+async def test_store_view_should_get_store_including_addresses(
+    client: AsyncClient, include
+):
+    """Test store view should get store including addresses."""
+    user = await UserFactory.create(email_verified_at=datetime.now())
+    token = await create_access_token(user=user)
+
+    store = await StoreFactory.create(addresses=[await AddressFactory.build()])
+
+    response = await client.get(
+        api_router.url_path_for("get_store", store_id=store.id),
+        params={"include": include},
+        headers={"Authorization": f"Bearer {token['access_token']}"},
+    )
+    response_stores = await client.get(
+        api_router.url_path_for("get_stores"), params={"include": include}
+    )
+
+    if include:
+        assert len(response.json()["addresses"]) == 1
+        assert len(response_stores.json()["items"][0]["addresses"]) == 1
+    else:
+        assert response.json()["addresses"] is None
+        assert response_stores.json()["items"][0]["addresses"] is None
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize("email_verified_at", [None, datetime.now()])
 async def test_store_view_should_update_store(
@@ -1,7 +1,23 @@
+from datetime import datetime
+
 import pytest
+from fastapi import Depends, FastAPI, status
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
 
+from app import depends
+from app.auth.services import create_access_token
 from app.config import Settings
+from app.core.middleware import ReadYourWritesMiddleware
+from app.database import engine
 from app.depends import get_settings
+from app.main import api_router
+from app.store.models import StorePerson
+from tests.app.address.factories import AddressFactory
+from tests.app.store.factories import StoreFactory
+from tests.app.user.factories import UserFactory
 
 
 @pytest.mark.asyncio
@@ -11,3 +27,84 @@ async def test_dependencies_should_get_settings():
     settings = get_settings()
 
     assert isinstance(settings, Settings)
+
+
+@pytest.mark.asyncio
+async def test_dependencies_should_route_read_session(app, monkeypatch):
+    """Test dependencies should route read session."""
+    read_engine = create_async_engine(
+        "sqlite+aiosqlite:///./instance/testing_replica.db"
+    )
+    monkeypatch.setattr(
+        depends,
+        "async_read_session",
+        sessionmaker(bind=read_engine, class_=AsyncSession),
+    )
+
+    router_app = FastAPI()
+    router_app.add_middleware(ReadYourWritesMiddleware, max_age=10)
+
+    @router_app.get("/read")
+    async def read(session: AsyncSession = Depends(depends.get_read_session)):
+        return {"database": session.bind.url.database}
+
+    @router_app.post("/write")
+    async def write(session: AsyncSession = Depends(depends.get_session)):
+        return {"database": session.bind.url.database}
+
+    async with AsyncClient(app=router_app, base_url="http://test") as client:
+        read_response = await client.get("/read")
+        write_response = await client.post("/write")
+        read_own_writes_response = await client.get("/read")
+
+    await read_engine.dispose()
+
+    assert read_response.json() == {
+        "database": "./instance/testing_replica.db"
+    }
+    assert write_response.json() == {"database": "./instance/testing.db"}
+    assert "read_your_writes" in write_response.cookies
+    assert read_own_writes_response.json() == {
+        "database": "./instance/testing.db"
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "address_id, status_code, commits",
+    [(None, status.HTTP_200_OK, 1), (0, status.HTTP_404_NOT_FOUND, 0)],
+)
+async def test_dependencies_should_commit_once_per_request(
+    client: AsyncClient, address_id, status_code, commits
+):
+    """Test dependencies should commit once per request."""
+    user = await UserFactory.create(email_verified_at=datetime.now())
+    token = await create_access_token(user=user)
+    store = await StoreFactory.create(
+        people=[StorePerson(is_owner=True, user=user)]
+    )
+    address = await AddressFactory.create(
+        parent_id=store.id, discriminator="store"
+    )
+
+    committed = []
+
+    def commit(connection):
+        committed.append(connection)
+
+    event.listen(engine.sync_engine, "commit", commit)
+    try:
+        response = await client.put(
+            api_router.url_path_for(
+                "update_store_address",
+                store_id=store.id,
+                address_id=address.id if address_id is None else address_id,
+            ),
+            headers={"Authorization": f"Bearer {token['access_token']}"},
+            json={"name": "Main"},
+        )
+    finally:
+        event.remove(engine.sync_engine, "commit", commit)
+
+    assert response.status_code == status_code
+    assert len(committed) == commits
@@ -6,6 +6,9 @@ from httpx import AsyncClient
 
 from alembic import command
 from alembic.config import Config
+from app.auth.depends import TOKEN_CLAIMS
+from app.auth.revocation import REVOKED_TOKENS
+from app.auth.services import CURRENT_USERS
 from app.config import Settings
 from app.depends import get_settings
 from app.main import app
@@ -32,6 +35,9 @@ def app() -> Generator:
 
     alembic_cfg = Config("alembic.ini")
     command.upgrade(alembic_cfg, "head")
+    CURRENT_USERS.clear()
+    REVOKED_TOKENS.clear()
+    TOKEN_CLAIMS.clear()
 
     yield app
 